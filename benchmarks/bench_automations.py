@@ -0,0 +1,37 @@
+"""
+Benchmark: re-running an automation on a settled home.
+
+Usage: python benchmarks/bench_automations.py [device_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import generate_home
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    home = generate_home(count, seed=5)
+    devices = home.devices
+
+    def run(label):
+        start = time.perf_counter()
+        applied, skipped = home.run_automation("Good Night")
+        print(f"{label:<36} {(time.perf_counter() - start) * 1e3:8.1f} ms, "
+              f"{applied:,} applied, {skipped:,} skipped")
+
+    run("First run (plan built)")
+    run("Settled re-run")
+    run("Settled re-run")
+    for device in devices[::1000]:
+        device.toggle_power()
+    run(f"Re-run after {len(devices[::1000]):,} devices drifted")
+    home.run_automation("Good Morning")
+    run("Run after Good Morning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark: batch command runner throughput.
+"""
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import SmartHome, generate_devices, run_batch
+
+DEVICE_COUNT = 20_000
+CONTROL_COUNT = 100_000
+
+
+def build_script():
+    lines = []
+    ids = []
+    for device in generate_devices(DEVICE_COUNT, seed=1):
+        lines.append("add " + json.dumps(device.to_dict()))
+        ids.append(device.id)
+    lights = [device_id for device_id in ids if device_id.startswith("L")]
+    for n in range(CONTROL_COUNT):
+        lines.append(f"control {lights[n % len(lights)]} dim {n % 101}")
+        if n % 10_000 == 0:
+            lines.append("automation Good Night")
+    lines.append("mode Away")
+    return lines
+
+
+def main():
+    lines = build_script()
+    home = SmartHome("Benchmark Home")
+    out = io.StringIO()
+    start = time.perf_counter()
+    executed, failed = run_batch(home, lines, out)
+    elapsed = time.perf_counter() - start
+    print(f"{executed:,} commands ({failed} failed) in {elapsed:.2f} s: {executed / elapsed:,.0f} commands/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Multithreaded stress benchmark for a thread-safe SmartHome.
+
+Writer threads add/remove devices and issue device commands through
+SmartHome.control while reader threads run find_device and room queries
+and a scheduler thread runs automations.
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Light, Thermostat, SmartHome, DeviceNotFoundException
+
+DEVICE_COUNT = 20_000
+OPERATIONS = 50_000
+ROOMS = ["Living Room", "Kitchen", "Bedroom", "Hallway"]
+
+
+def build_home():
+    home = SmartHome("Benchmark Home", thread_safe=True)
+    for i in range(DEVICE_COUNT):
+        if i % 2:
+            home.add_device(Light(f"L{i}", "Light", True, True, ROOMS[i % 4], 80, "White"))
+        else:
+            home.add_device(Thermostat(f"T{i}", "Thermostat", True, True, ROOMS[i % 4], 22.5, "Heat", 23.0))
+    return home
+
+
+def commander(home, seed):
+    rng = random.Random(seed)
+    for _ in range(OPERATIONS):
+        i = rng.randrange(1, DEVICE_COUNT, 2)
+        try:
+            home.control(f"L{i}", "dim", rng.randrange(101))
+        except DeviceNotFoundException:
+            pass
+
+
+def churner(home, seed):
+    rng = random.Random(seed)
+    for n in range(OPERATIONS // 10):
+        device_id = f"X{seed}-{n}"
+        home.add_device(Light(device_id, "Temp", True, True, rng.choice(ROOMS), 50, "White"))
+        home.remove_device(device_id)
+
+
+def reader(home, seed):
+    rng = random.Random(seed)
+    for n in range(OPERATIONS):
+        if n % 1000 == 0:
+            home.get_devices_by_room(rng.choice(ROOMS))
+        else:
+            home.find_device(f"T{rng.randrange(0, DEVICE_COUNT, 2)}")
+
+
+def scheduler(home, seed):
+    for name in ["Good Morning", "Good Night", "Away Mode"] * 3:
+        home.execute_automation(name)
+
+
+def run(label, workers):
+    home = build_home()
+    threads = [threading.Thread(target=target, args=(home, seed)) for seed, target in enumerate(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert len(home.devices) == DEVICE_COUNT
+    print(f"{label:<44} {elapsed * 1000:9.1f} ms")
+
+
+def main():
+    run("4 commanders", [commander] * 4)
+    run("4 readers", [reader] * 4)
+    run("2 commanders + 2 readers + churn", [commander, commander, reader, reader, churner])
+    run("mixed + automation scheduler", [commander, commander, reader, reader, churner, scheduler])
+
+
+if __name__ == "__main__":
+    main()
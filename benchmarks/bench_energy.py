@@ -0,0 +1,55 @@
+"""
+Benchmark: vectorized EnergyEstimator recompute vs per-device power_watts.
+
+Usage: python benchmarks/bench_energy.py [device_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Light, Thermostat, Camera, MotionSensor, SmartHome, EnergyEstimator
+
+HOMES = 10
+
+
+def build_homes(count):
+    homes = [SmartHome(f"Home {n}") for n in range(HOMES)]
+    modes = ["Heat", "Cool", "Auto", "Off"]
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            device = Light(f"L{i}", "Light", i % 3 != 0, True, "Room", i % 101, "White")
+        elif kind == 1:
+            device = Thermostat(f"T{i}", "Thermostat", True, True, "Room", 15 + i % 15, modes[i % 4], 22.0)
+        elif kind == 2:
+            device = Camera(f"C{i}", "Camera", True, True, "Room", "Armed", 80, "1080p", i % 2 == 0)
+        else:
+            device = MotionSensor(f"M{i}", "Sensor", True, True, "Room", "Armed", 60, 10, None)
+        homes[i % HOMES].add_device(device)
+    return homes
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    homes = timed(f"build {count:,} devices", lambda: build_homes(count))
+    estimator = EnergyEstimator(*homes)
+    timed("initial table build + estimate", estimator.instant_watts)
+    total = timed("vectorized recompute", estimator.instant_watts)
+    timed("per-device power_watts", lambda: sum(h.power_watts() for h in homes))
+    lights = homes[0].get_devices_by_type(Light)[:10_000]
+    timed("10,000 incremental row updates", lambda: [light.dim(50) for light in lights])
+    timed("vectorized recompute after updates", estimator.instant_watts)
+    print(f"fleet draw {total / 1000:,.1f} kW, {estimator.projected_kwh(24):,.0f} kWh/day projected")
+
+
+if __name__ == "__main__":
+    main()
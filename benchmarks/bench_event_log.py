@@ -0,0 +1,63 @@
+"""
+Benchmark: event log append throughput and recovery time for a large home.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Light, Thermostat, Camera, MotionSensor, SmartHome, EventLog
+
+DEVICE_COUNT = 100_000
+MUTATIONS = 100_000
+
+
+def build_home(count):
+    home = SmartHome("Benchmark Home")
+    rooms = ["Living Room", "Kitchen", "Bedroom", "Hallway", "Front Door", "Backyard"]
+    for i in range(count):
+        room = rooms[i % len(rooms)]
+        kind = i % 4
+        if kind == 0:
+            device = Light(f"L{i}", "Light", True, True, room, 80, "White")
+        elif kind == 1:
+            device = Thermostat(f"T{i}", "Thermostat", True, True, room, 22.5, "Heat", 23.0)
+        elif kind == 2:
+            device = Camera(f"C{i}", "Camera", True, True, room, "Armed", 80, "1080p", False)
+        else:
+            device = MotionSensor(f"M{i}", "Sensor", True, True, room, "Armed", 60, 10, None)
+        home.add_device(device)
+    return home
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    home = build_home(DEVICE_COUNT)
+    devices = home.devices
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "home.log")
+        log = timed("attach + initial snapshot", lambda: EventLog(path, batch_size=1024).attach(home))
+
+        def mutate():
+            for i in range(MUTATIONS):
+                devices[i % DEVICE_COUNT].toggle_power()
+            log.flush()
+
+        timed(f"{MUTATIONS:,} logged mutations", mutate)
+        timed("change_mode('Night')", lambda: (home.change_mode("Night"), log.flush()))
+        log.close()
+        restored = timed("replay snapshot + log", lambda: EventLog.replay(path))
+        assert restored.render_devices() == home.render_devices()
+        assert restored.mode == home.mode
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark: synthetic device generation rate and streaming memory footprint.
+
+Usage: python benchmarks/bench_generator.py [device_count]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import generate_devices, generate_fleet
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    types = Counter()
+    start = time.perf_counter()
+    for device in generate_devices(count, seed=42):
+        types[type(device).__name__] += 1
+    elapsed = time.perf_counter() - start
+    print(f"streamed {count:,} devices in {elapsed:.2f} s ({count / elapsed:,.0f}/s)")
+    print("class mix:", dict(types))
+
+    tracemalloc.start()
+    for device in generate_devices(100_000, seed=42):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"peak traced memory while streaming 100,000 devices: {peak / 1024:.0f} KiB")
+
+    start = time.perf_counter()
+    total = sum(len(home.devices) for home in generate_fleet(100, 1_000, seed=42))
+    print(f"built fleet of 100 homes / {total:,} devices in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: heartbeat expiry ticks with a timing wheel vs a full deadline scan.
+
+Usage: python benchmarks/bench_heartbeat.py [device_count]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import HeartbeatMonitor, MotionSensor, SmartHome
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    home = SmartHome("Benchmark Home")
+    for i in range(count):
+        home.add_device(MotionSensor(f"M{i}", f"Sensor {i}", True, True, f"Room {i % 100}", "Armed", 60, 10, None))
+    clock = [0.0]
+    monitor = HeartbeatMonitor(home, timeout=30, resolution=1, clock=lambda: clock[0])
+    rng = random.Random(5)
+    ids = [f"M{i}" for i in range(count)]
+
+    # Every device beats once in the first 10 s; 0.1% then go silent
+    start = time.perf_counter()
+    for i, device_id in enumerate(ids):
+        clock[0] = 10.0 * i / count
+        monitor.heartbeat(device_id)
+    print(f"{count:,} heartbeats: {time.perf_counter() - start:.2f} s")
+    silent = set(rng.sample(ids, count // 1000))
+    alive = [device_id for device_id in ids if device_id not in silent]
+
+    ticks = expired = 0
+    tick_time = 0.0
+    for second in range(11, 45):
+        clock[0] = float(second)
+        for device_id in alive[(second % 10)::10]:
+            monitor.heartbeat(device_id)
+        start = time.perf_counter()
+        expired += len(monitor.tick())
+        tick_time += time.perf_counter() - start
+        ticks += 1
+    print(f"{ticks} wheel ticks: {tick_time / ticks * 1e3:.3f} ms per tick, {expired:,} expired "
+          f"(connected {home.connected_count:,}/{count:,})")
+
+    deadlines = {device_id: 30.0 for device_id in ids}
+    start = time.perf_counter()
+    [device_id for device_id, deadline in deadlines.items() if deadline < clock[0]]
+    print(f"one full deadline scan: {(time.perf_counter() - start) * 1e3:.3f} ms")
+
+    start = time.perf_counter()
+    home.display_info()
+    print(f"display_info with incremental connected count: {(time.perf_counter() - start) * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: floor/zone rollups and subtree queries vs rescanning all devices.
+
+Usage: python benchmarks/bench_hierarchy.py [device_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Light, RoomHierarchy, generate_home
+
+
+def timed(label, func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    print(f"{label:<40} {(time.perf_counter() - start) / repeat * 1e3:8.3f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    home = generate_home(count, seed=9)
+    rooms = sorted(home.rooms)
+    # Spread the generated rooms over 3 floors
+    layout = {room: (i % 3, "NESW"[i // 3 % 4]) for i, room in enumerate(rooms)}
+    start = time.perf_counter()
+    hierarchy = RoomHierarchy(home, layout)
+    print(f"built hierarchy over {count:,} devices in {time.perf_counter() - start:.2f} s")
+    floor_rooms = {room for room, (floor, _) in layout.items() if floor == 1}
+
+    timed("floor 1 rollup via scan", lambda: sum(1 for d in home.devices if d.location in floor_rooms and d.is_on))
+    timed("floor 1 rollup via hierarchy", lambda: hierarchy.rollup(floor=1))
+    timed("lights on floor 1 via scan",
+          lambda: [d for d in home.devices if isinstance(d, Light) and d.location in floor_rooms])
+    timed("lights on floor 1 via hierarchy", lambda: hierarchy.devices(Light, floor=1))
+
+    devices = home.devices[:50_000]
+    start = time.perf_counter()
+    for device in devices:
+        device.toggle_power()
+    print(f"{len(devices):,} toggles with incremental rollups: {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
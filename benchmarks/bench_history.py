@@ -0,0 +1,72 @@
+"""
+Benchmark: delta-encoded device history versus one full snapshot per change.
+
+Usage: python benchmarks/bench_history.py [device_count] [change_count]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import DeviceHistory, Light, generate_home
+
+
+def churn(home, count, clock, seed=7):
+    rng = random.Random(seed)
+    lights = home.get_devices_by_type(Light)
+    for _ in range(count):
+        clock[0] += 0.01
+        light = rng.choice(lights)
+        if rng.random() < 0.5:
+            light.toggle_power()
+        else:
+            light.dim(rng.randrange(101))
+
+
+def measure(label, devices, count, subscribe):
+    """Time the churn with ``subscribe(home, clock)`` attached, then measure its memory in a traced rerun."""
+    home, clock = generate_home(devices, seed=3), [0.0]
+    store = subscribe(home, clock)
+    start = time.perf_counter()
+    churn(home, count, clock)
+    elapsed = time.perf_counter() - start
+    traced_home, traced_clock = generate_home(devices, seed=3), [0.0]
+    tracemalloc.start()
+    traced = subscribe(traced_home, traced_clock)
+    churn(traced_home, count, traced_clock)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+    print(f"{label:<28} {elapsed:6.2f} s, {size / 2**20:8.1f} MiB")
+    return home, store, clock
+
+
+def main():
+    devices = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    print(f"{devices:,} devices, {changes:,} changes")
+
+    def snapshots(home, clock):
+        log = []
+        home.subscribe(lambda event, device: log.append((clock[0], device.to_dict())))
+        return log
+    measure("Full snapshot per change", devices, changes, snapshots)
+    home, history, clock = measure("DeviceHistory", devices, changes,
+                                   lambda home, clock: DeviceHistory(home, clock=lambda: clock[0]))
+    measure("DeviceHistory, 60 s kept", devices, changes,
+            lambda home, clock: DeviceHistory(home, retention=60.0, block_size=16, clock=lambda: clock[0]))
+
+    ids = [light.id for light in home.get_devices_by_type(Light)]
+    rng = random.Random(1)
+    queries = 100_000
+    start = time.perf_counter()
+    for _ in range(queries):
+        history.state_at(rng.choice(ids), rng.uniform(0, clock[0]))
+    print(f"state_at: {(time.perf_counter() - start) / queries * 1e6:.1f} us per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: import time of the package core versus its lazily loaded subsystems.
+
+Each case runs in a fresh interpreter with ``-X importtime``; the reported
+time is the median of the cumulative microseconds of the top-level imports
+the statement triggers (the interpreter's own startup imports excluded).
+
+Usage: python benchmarks/bench_import.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("import smart_home_system", "import smart_home_system"),
+    ("core classes", "from smart_home_system import Device, SmartHome"),
+    ("generators", "from smart_home_system import generate_home"),
+    ("EventLog", "from smart_home_system import EventLog"),
+    ("RecordingStore", "from smart_home_system import RecordingStore"),
+    ("analytics", "from smart_home_system import MotionAnalytics, RoomHierarchy, DeviceHistory, HeartbeatMonitor"),
+    ("run_batch", "from smart_home_system import run_batch"),
+    ("HomeServer", "from smart_home_system import HomeServer"),
+    ("EnergyEstimator + numpy", "from smart_home_system import EnergyEstimator; EnergyEstimator()"),
+    ("everything", "import smart_home_system as s; [getattr(s, name) for name in s.__all__]"),
+]
+
+
+def import_micros(statement, env):
+    """Return the cumulative import time in microseconds of ``statement``, excluding interpreter startup."""
+    baseline = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"],
+                              capture_output=True, text=True, cwd=ROOT, env=env).stderr
+    startup = {line.rsplit("|", 1)[1].strip() for line in baseline.splitlines() if "|" in line}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, cwd=ROOT, env=env, check=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Top-level entries have no indentation beyond the single separator space
+        if not name[1:].startswith(" ") and name.strip() not in startup:
+            total += int(cumulative)
+    return total
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # Measure with warm bytecode caches, as deployed
+    for _, statement in CASES:
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, env=env, capture_output=True)
+    for label, statement in CASES:
+        samples = [import_micros(statement, env) for _ in range(runs)]
+        print(f"{label:<28} {statistics.median(samples) / 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: memory saved by interned attributes, and dump size and time with symbol codes.
+
+Usage: python benchmarks/bench_interning.py [device_count]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import SmartHome, generate_home
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    home = generate_home(count, seed=5)
+    dumps = {}
+    for label, symbols in (("plain", False), ("symbol-coded", True)):
+        stream = io.StringIO()
+        start = time.perf_counter()
+        home.dump(stream, symbols=symbols)
+        elapsed = time.perf_counter() - start
+        dumps[label] = stream.getvalue()
+        print(f"dump {label}: {len(dumps[label]) / 1e6:.1f} MB in {elapsed * 1e3:.0f} ms")
+
+    # Both layouts intern on load, so the memory gain is measured against
+    # every device holding its own copy of its location string
+    loaded = SmartHome.load(io.StringIO(dumps["plain"]))
+    locations = {id(d.location): d.location for d in loaded.devices}
+    shared = sum(sys.getsizeof(location) for location in locations.values())
+    copies = sum(sys.getsizeof(d.location) for d in loaded.devices)
+    print(f"location strings: {len(locations)} distinct objects, {shared / 1e3:.1f} KB interned "
+          f"vs {copies / 1e6:.1f} MB as per-device copies")
+
+    rooms = sorted(home.rooms)
+    start = time.perf_counter()
+    for room in rooms:
+        home.get_devices_by_room("".join(room))  # a fresh, non-interned copy of the name
+    elapsed = time.perf_counter() - start
+    print(f"get_devices_by_room over {len(rooms)} rooms: {elapsed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
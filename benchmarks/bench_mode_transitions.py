@@ -0,0 +1,38 @@
+"""
+Benchmark: mode changes running cached, diff-based automation plans.
+
+Usage: python benchmarks/bench_mode_transitions.py [device_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Light, generate_home
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    home = generate_home(count, seed=4)
+    writes = [0]
+    home.subscribe(lambda event, subject: writes.__setitem__(0, writes[0] + (event == "changed")))
+
+    def transition(mode, label):
+        writes[0] = 0
+        start = time.perf_counter()
+        home.change_mode(mode)
+        print(f"{label:<44} {(time.perf_counter() - start) * 1e3:8.1f} ms, {writes[0]:,} devices changed")
+
+    transition("Night", "Home -> Night (plan built, devices change)")
+    transition("Night", "Night -> Night (cached plan, settled)")
+    transition("Away", "Night -> Away (plan built)")
+    transition("Night", "Away -> Night (cached plan)")
+    transition("Vacation", "Night -> Vacation (plan built)")
+    transition("Night", "Vacation -> Night (cached plan)")
+    home.add_device(Light("extra", "Extra Light", True, True, "Hallway", 50, "White"))
+    transition("Night", "Night -> Night after add (plan rebuilt)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: windowed motion trigger counting and O(1) rate queries across a fleet.
+
+Usage: python benchmarks/bench_motion.py [sensor_count] [trigger_count]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import MotionAnalytics, MotionSensor, SmartHome
+
+
+def main():
+    sensors = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    triggers = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    home = SmartHome("Benchmark Home")
+    devices = [MotionSensor(f"M{i}", f"Sensor {i}", True, True, f"Room {i % 500}", "Armed", 60, 10, None)
+               for i in range(sensors)]
+    for device in devices:
+        home.add_device(device)
+    clock = [0.0]
+    analytics = MotionAnalytics(home, clock=lambda: clock[0])
+    rng = random.Random(11)
+    order = [devices[rng.randrange(sensors)] for _ in range(triggers)]
+
+    start = time.perf_counter()
+    for i, device in enumerate(order):
+        clock[0] = i * 0.01  # 100 triggers per simulated second
+        device.detect_motion(clock[0])
+    elapsed = time.perf_counter() - start
+    print(f"{triggers:,} triggers over {sensors:,} sensors: {elapsed:.2f} s ({triggers / elapsed:,.0f}/s)")
+
+    tracemalloc.start()
+    sized = MotionAnalytics(clock=lambda: clock[0])
+    for device in devices:
+        sized.record(device)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"counter memory: {current / sensors:,.0f} bytes per sensor (incl. rooms)")
+
+    start = time.perf_counter()
+    for i in range(100_000):
+        analytics.sensor_count(f"M{i % sensors}")
+        analytics.room_count(f"Room {i % 500}", "hour")
+    print(f"200,000 window queries: {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    start = time.perf_counter()
+    hot = analytics.alerts(3)
+    print(f"alert sweep: {len(hot):,} sensors at >= 3/min in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: synthetic multi-camera frame stream into the memory-mapped recording ring.
+
+Usage: python benchmarks/bench_recording.py [camera_count] [frames] [capacity_mb]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Camera, RecordingStore, SmartHome
+
+
+def main():
+    cameras = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    capacity = (int(sys.argv[3]) if len(sys.argv) > 3 else 64) * 1024 * 1024
+    home = SmartHome("Benchmark Home")
+    for i in range(cameras):
+        home.add_device(Camera(f"C{i}", f"Camera {i}", True, True, f"Zone {i % 50}", "Armed", 80, "1080p", True))
+    rng = random.Random(3)
+    order = [f"C{rng.randrange(cameras)}" for _ in range(frames)]
+    payloads = [os.urandom(size) for size in (512, 1024, 2048, 4096)]
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            RecordingStore(os.path.join(tmp, "frames.ring"), capacity=capacity).attach(home) as store:
+        start = time.perf_counter()
+        written = 0
+        for i, camera_id in enumerate(order):
+            payload = payloads[i & 3]
+            store.append(camera_id, payload, timestamp=i * 0.001)
+            written += len(payload)
+        elapsed = time.perf_counter() - start
+        print(f"{frames:,} frames from {cameras:,} cameras: {elapsed:.2f} s "
+              f"({frames / elapsed:,.0f} frames/s, {written / elapsed / 1e6:,.0f} MB/s)")
+        print(f"ring {capacity / 1e6:.0f} MB wrapped {written / capacity:.1f}x")
+
+        tracemalloc.start()
+        for i, camera_id in enumerate(order[:50_000]):
+            store.append(camera_id, payloads[i & 3], timestamp=i * 0.001)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"peak Python allocations over 50,000 more writes: {peak / 1e3:.0f} kB")
+
+        segment = store.segments("C0")[-1]
+        start = time.perf_counter()
+        retained = len(store.read(segment))
+        print(f"read back {retained} retained frames of C0 in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: full inventory dump with cached vs uncached display_info rendering.
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Light, Thermostat, Camera, MotionSensor, SmartHome
+
+DEVICE_COUNT = 100_000
+
+
+def build_home(count):
+    home = SmartHome("Benchmark Home")
+    rooms = ["Living Room", "Kitchen", "Bedroom", "Hallway", "Front Door", "Backyard"]
+    for i in range(count):
+        room = rooms[i % len(rooms)]
+        kind = i % 4
+        if kind == 0:
+            device = Light(f"L{i}", "Light", True, True, room, 80, "White")
+        elif kind == 1:
+            device = Thermostat(f"T{i}", "Thermostat", True, True, room, 22.5, "Heat", 23.0)
+        elif kind == 2:
+            device = Camera(f"C{i}", "Camera", True, True, room, "Armed", 80, "1080p", False)
+        else:
+            device = MotionSensor(f"M{i}", "Sensor", True, True, room, "Armed", 60, 10, None)
+        home.add_device(device)
+    return home
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms")
+
+
+def main():
+    home = build_home(DEVICE_COUNT)
+    devices = home.devices
+
+    def naive():
+        buffer = io.StringIO()
+        for device in devices:
+            buffer.write(device._render_info() + "\n")
+
+    timed("naive per-device rendering", naive)
+    timed("bulk render (cold cache)", lambda: home.render_devices(io.StringIO()))
+    timed("bulk render (warm cache)", lambda: home.render_devices(io.StringIO()))
+    with open(os.devnull, "w") as sink:
+        timed("bulk render to file (warm cache)", lambda: home.render_devices(sink))
+
+
+if __name__ == "__main__":
+    main()
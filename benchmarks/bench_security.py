@@ -0,0 +1,47 @@
+"""
+Benchmark: indexed security sweeps vs full scans on homes with few security devices.
+
+Usage: python benchmarks/bench_security.py [device_count] [security_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Camera, Light, MotionSensor, SecurityDevice, SmartHome
+
+
+def timed(label, func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<34} {elapsed * 1e3:8.3f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    security = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    home = SmartHome("Benchmark Home")
+    for i in range(count - security):
+        home.add_device(Light(f"L{i}", f"Light {i}", i % 2 == 0, True, f"Room {i % 20}", 50, "White"))
+    for i in range(security):
+        if i % 2:
+            home.add_device(Camera(f"C{i}", f"Camera {i}", True, True, "Front Door", "Disarmed", 80, "1080p", False))
+        else:
+            home.add_device(MotionSensor(f"M{i}", f"Sensor {i}", False, True, "Backyard", "Disarmed", 60, 10, None))
+    print(f"{count:,} devices, {security:,} security devices")
+
+    def full_scan():
+        return [d for d in home.devices if isinstance(d, SecurityDevice)
+                and not (d.armed_status == "Armed" and d.is_on)]
+
+    timed("report via full scan", full_scan)
+    timed("report via index", lambda: home.security_sweep("report"))
+    timed("arm + disarm via index", lambda: (home.security_sweep("arm"), home.security_sweep("disarm")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: bulk SmartHome.dump (JSON Lines / MessagePack) vs naive per-device json.dumps.
+"""
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Light, Thermostat, Camera, MotionSensor, SmartHome
+
+DEVICE_COUNT = 100_000
+
+
+def build_home(count):
+    home = SmartHome("Benchmark Home")
+    rooms = ["Living Room", "Kitchen", "Bedroom", "Hallway", "Front Door", "Backyard"]
+    for i in range(count):
+        room = rooms[i % len(rooms)]
+        kind = i % 4
+        if kind == 0:
+            device = Light(f"L{i}", "Light", True, True, room, 80, "White")
+        elif kind == 1:
+            device = Thermostat(f"T{i}", "Thermostat", True, True, room, 22.5, "Heat", 23.0)
+        elif kind == 2:
+            device = Camera(f"C{i}", "Camera", True, True, room, "Armed", 80, "1080p", False)
+        else:
+            device = MotionSensor(f"M{i}", "Sensor", True, True, room, "Armed", 60, 10, None)
+        home.add_device(device)
+    return home
+
+
+def timed(label, func, count):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1000:9.1f} ms  {count / elapsed:12,.0f} devices/s")
+    return result
+
+
+def main():
+    home = build_home(DEVICE_COUNT)
+
+    def naive():
+        buffer = io.StringIO()
+        for device in home.devices:
+            buffer.write(json.dumps(device.to_dict()))
+            buffer.write("\n")
+        return buffer
+
+    timed("naive json.dumps per device", naive, DEVICE_COUNT)
+    timed("SmartHome.dump jsonl", lambda: home.dump(io.StringIO()), DEVICE_COUNT)
+    timed("SmartHome.dump jsonl, symbol-coded", lambda: home.dump(io.StringIO(), symbols=True), DEVICE_COUNT)
+    text = io.StringIO()
+    home.dump(text)
+    text.seek(0)
+    timed("SmartHome.load jsonl", lambda: SmartHome.load(text), DEVICE_COUNT)
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        print("msgpack not installed; skipping MessagePack benchmark")
+        return
+    timed("SmartHome.dump msgpack", lambda: home.dump(io.BytesIO(), format="msgpack"), DEVICE_COUNT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Load test: HomeServer on localhost with keep-alive clients.
+
+Starts a server in-process on an ephemeral port, then drives it with
+concurrent keep-alive connections issuing single-command requests, and
+compares that with the same commands sent through /batch.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import HomeServer, Light, generate_home
+
+DEVICE_COUNT = 10_000
+CLIENTS = 8
+REQUESTS_PER_CLIENT = 2_000
+BATCH_SIZE = 500
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+                 .encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def single_client(port, light_ids, offset):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for n in range(REQUESTS_PER_CLIENT):
+        light_id = light_ids[(offset + n) % len(light_ids)]
+        if n % 2:
+            await request(reader, writer, "POST", f"/devices/{light_id}/dim", {"args": [n % 101]})
+        else:
+            await request(reader, writer, "GET", f"/devices/{light_id}")
+    writer.close()
+
+
+async def batch_client(port, light_ids, offset):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for start in range(0, REQUESTS_PER_CLIENT, BATCH_SIZE):
+        commands = [f"control {light_ids[(offset + n) % len(light_ids)]} dim {n % 101}"
+                    for n in range(start, start + BATCH_SIZE)]
+        await request(reader, writer, "POST", "/batch", {"commands": commands})
+    writer.close()
+
+
+async def run(label, client, server, light_ids):
+    start = time.perf_counter()
+    await asyncio.gather(*(client(server.port, light_ids, n * 997) for n in range(CLIENTS)))
+    elapsed = time.perf_counter() - start
+    total = CLIENTS * REQUESTS_PER_CLIENT
+    print(f"{label:<32} {total:,} commands in {elapsed:.2f} s ({total / elapsed:,.0f} commands/s)")
+
+
+async def main():
+    home = generate_home(DEVICE_COUNT, seed=3)
+    light_ids = [d.id for d in home.get_devices_by_type(Light)]
+    server = await HomeServer(home, port=0).start()
+    await run("keep-alive single requests", single_client, server, light_ids)
+    await run(f"/batch of {BATCH_SIZE}", batch_client, server, light_ids)
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
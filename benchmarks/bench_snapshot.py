@@ -0,0 +1,83 @@
+"""
+Benchmark: dashboard-style reads through SmartHome.snapshot vs the live home.
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Light, SmartHome
+
+DEVICE_COUNT = 100_000
+READS = 500
+ROOMS = [f"Room {n}" for n in range(50)]
+
+
+def build_home():
+    home = SmartHome("Benchmark Home", thread_safe=True)
+    for i in range(DEVICE_COUNT):
+        home.add_device(Light(f"L{i}", "Light", True, True, ROOMS[i % len(ROOMS)], 80, "White"))
+    return home
+
+
+def live_reader(home):
+    for n in range(READS):
+        home.devices
+        home.get_devices_by_room(ROOMS[n % len(ROOMS)])
+
+
+def snapshot_reader(home):
+    for n in range(READS):
+        snapshot = home.snapshot()
+        snapshot.devices
+        snapshot.get_devices_by_room(ROOMS[n % len(ROOMS)])
+
+
+def writer(home, stop):
+    n = 0
+    while not stop.is_set():
+        device_id = f"W{n}"
+        home.add_device(Light(device_id, "Temp", True, True, ROOMS[n % len(ROOMS)], 50, "White"))
+        home.remove_device(device_id)
+        n += 1
+        time.sleep(0.001)
+
+
+def run(label, reader):
+    home = build_home()
+    stop = threading.Event()
+    background = threading.Thread(target=writer, args=(home, stop))
+    background.start()
+    start = time.perf_counter()
+    reader(home)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    background.join()
+    print(f"{label:<36} {elapsed * 1000:9.1f} ms for {READS:,} reads")
+
+
+def write_then_snapshot(count=200_000, writes=1_000):
+    home = SmartHome("Benchmark Home", thread_safe=True)
+    for i in range(count):
+        home.add_device(Light(f"L{i}", "Light", True, True, ROOMS[i % len(ROOMS)], 80, "White"))
+    start = time.perf_counter()
+    for n in range(writes):
+        home.add_device(Light(f"W{n}", "Temp", True, True, ROOMS[n % len(ROOMS)], 50, "White"))
+        home.snapshot()
+        home.remove_device(f"L{n * 97}")
+        home.snapshot()
+    elapsed = time.perf_counter() - start
+    print(f"{'write + snapshot on ' + format(count, ',') + ' devices':<36} "
+          f"{elapsed / (2 * writes) * 1e6:9.1f} us per write")
+
+
+def main():
+    run("live home reads", live_reader)
+    run("snapshot reads", snapshot_reader)
+    write_then_snapshot()
+
+
+if __name__ == "__main__":
+    main()
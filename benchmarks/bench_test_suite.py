@@ -0,0 +1,54 @@
+"""
+Benchmark: test suite wall time, serial versus sharded across worker processes.
+
+The collected tests are dealt round-robin into one shard per worker and
+each shard runs in its own ``pytest`` process; conftest.py isolates device
+counting and the device type registry per test. Results are kept in memory
+(YAKSHA_RESULT_SINK=memory) so no network is involved.
+
+Usage: python benchmarks/bench_test_suite.py [workers]
+"""
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def pytest(args, env):
+    return subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *args],
+                          capture_output=True, text=True, cwd=ROOT, env=env)
+
+
+def collect(env):
+    output = pytest(["--collect-only", "test"], env).stdout
+    return [line for line in output.splitlines() if "::" in line]
+
+
+def run_sharded(tests, workers, env):
+    shards = [tests[start::workers] for start in range(workers)]
+    # Threads only wait on the pytest worker processes
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(lambda shard: pytest(shard, env), [shard for shard in shards if shard]))
+    return all(result.returncode == 0 for result in results)
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 2
+    env = dict(os.environ, YAKSHA_RESULT_SINK="memory")
+    tests = collect(env)
+    print(f"{len(tests)} tests, {workers} workers")
+
+    start = time.perf_counter()
+    passed = pytest(["test"], env).returncode == 0
+    print(f"{'Serial':<10} {time.perf_counter() - start:6.2f} s, {'passed' if passed else 'FAILED'}")
+
+    start = time.perf_counter()
+    passed = run_sharded(tests, workers, env)
+    print(f"{'Parallel':<10} {time.perf_counter() - start:6.2f} s, {'passed' if passed else 'FAILED'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark: simulated hours per wall-clock second for a fleet of thermostats.
+
+Usage: python benchmarks/bench_thermostat_simulation.py [thermostat_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Thermostat, ThermostatSimulator
+
+TICK_HOURS = 1 / 60
+SIMULATED_HOURS = 24
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    modes = ["Heat", "Cool", "Auto", "Off"]
+    thermostats = [Thermostat(f"T{i}", "Thermostat", True, True, "Room", 10 + i % 20, modes[i % 4], 21.0)
+                   for i in range(count)]
+    simulator = ThermostatSimulator(thermostats, ambient=12.0)
+    steps = int(SIMULATED_HOURS / TICK_HOURS)
+    start = time.perf_counter()
+    simulator.step(TICK_HOURS, steps)
+    elapsed = time.perf_counter() - start
+    print(f"{count:,} thermostats, {steps:,} one-minute ticks in {elapsed * 1000:.1f} ms")
+    print(f"{SIMULATED_HOURS / elapsed:,.0f} simulated hours per wall-second")
+    start = time.perf_counter()
+    simulator.write_back()
+    print(f"write_back in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: per-record construction vs schema batch validation of raw records.
+
+Usage: python benchmarks/bench_validation.py [record_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_home_system import Device, InvalidInputException, generate_devices
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    records = [device.to_dict() for device in generate_devices(count, seed=7)]
+    # Corrupt every 100th record so both paths see failures
+    for row in range(0, count, 100):
+        if "brightness" in records[row]:
+            records[row]["brightness"] = 101
+
+    start = time.perf_counter()
+    devices, failed = [], 0
+    for record in records:
+        try:
+            devices.append(Device.from_dict(record))
+        except InvalidInputException:
+            failed += 1
+    construct = time.perf_counter() - start
+    print(f"from_dict one by one: {construct:.3f} s, {len(devices):,} built, {failed:,} rejected")
+    del devices
+
+    start = time.perf_counter()
+    errors = Device.validate_records(records)
+    validate = time.perf_counter() - start
+    print(f"validate_records:     {validate:.3f} s, {sum(1 for row in errors if row):,} rejected")
+
+    start = time.perf_counter()
+    devices, failures = Device.from_records(records)
+    bulk = time.perf_counter() - start
+    print(f"from_records:         {bulk:.3f} s, {len(devices):,} built, {len(failures):,} rejected")
+
+
+if __name__ == "__main__":
+    main()
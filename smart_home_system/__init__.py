@@ -0,0 +1,46 @@
+"""
+Smart Home System - A simplified implementation for HomeHub Technologies
+
+The device classes and SmartHome hub are imported eagerly from ``core``.
+Every other subsystem (persistence, recording, analytics, batch, server,
+CLI) is imported on first attribute access, so ``import smart_home_system``
+stays cheap and never loads asyncio, mmap or optional packages like numpy.
+"""
+import importlib
+
+from .core import (DeviceNotFoundException, InvalidInputException, SymbolTable, Schema, Device, Light, Thermostat,
+                   SecurityDevice, Camera, MotionSensor, DeviceType, DEVICE_REGISTRY, DEVICE_TYPES,
+                   register_device_type, device_type, isolated_registry, SceneTarget, AUTOMATIONS, MODE_AUTOMATIONS,
+                   HomeSnapshot, SmartHome)
+
+# Public name -> submodule that defines it, imported on first access
+_LAZY = {
+    "GENERATOR_PROFILE": "generators", "generate_devices": "generators",
+    "generate_home": "generators", "generate_fleet": "generators",
+    "EventLog": "persistence",
+    "RecordingSegment": "recording", "RecordingStore": "recording",
+    "EnergyEstimator": "energy", "ThermostatSimulator": "energy",
+    "WindowCounter": "motion", "MotionAnalytics": "motion",
+    "HeartbeatMonitor": "monitoring",
+    "RollupNode": "hierarchy", "RoomHierarchy": "hierarchy",
+    "HistoryBlock": "history", "DeviceHistory": "history",
+    "BATCH_COMMANDS": "batch", "run_batch": "batch",
+    "HomeServer": "server",
+    "main": "cli",
+}
+
+__all__ = ["DeviceNotFoundException", "InvalidInputException", "SymbolTable", "Schema", "Device", "Light",
+           "Thermostat", "SecurityDevice", "Camera", "MotionSensor", "DeviceType", "DEVICE_REGISTRY",
+           "DEVICE_TYPES", "register_device_type", "device_type", "isolated_registry", "SceneTarget",
+           "AUTOMATIONS", "MODE_AUTOMATIONS", "HomeSnapshot", "SmartHome"] + list(_LAZY)
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,8 @@
+"""
+Smart Home System - ``python -m smart_home_system`` entry point.
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Smart Home System - Scripted batch command execution.
+"""
+import json
+import shlex
+import sys
+from .core import Device, DeviceNotFoundException, InvalidInputException
+
+def _parse_command_args(text, raw=0):
+    """Split arguments shell-style, decoding JSON literals such as 50, 21.5 or true.
+    
+    The first ``raw`` tokens (device ID, command name) are kept as strings.
+    """
+    tokens = shlex.split(text)
+    values = tokens[:raw]
+    for token in tokens[raw:]:
+        try:
+            values.append(json.loads(token))
+        except ValueError:
+            values.append(token)
+    return values
+
+def _batch_add(home, text, out):
+    device = Device.from_dict(json.loads(text))
+    if not home.add_device(device):
+        raise InvalidInputException(f"Device with ID {device.id} already exists")
+
+def _batch_remove(home, text, out):
+    if not home.remove_device(text.strip()):
+        raise DeviceNotFoundException(f"Device with ID {text.strip()} not found")
+
+def _batch_control(home, text, out):
+    args = _parse_command_args(text, raw=2)
+    if len(args) < 2:
+        raise InvalidInputException("Usage: control <device_id> <command> [args...]")
+    home.control(*args)
+
+def _batch_automation(home, text, out):
+    home.run_automation(text.strip())
+
+def _batch_mode(home, text, out):
+    home.change_mode(text.strip())
+
+def _batch_list(home, text, out):
+    room = text.strip()
+    if room:
+        for device in home.get_devices_by_room(room):
+            out.write(device.display_info() + "\n")
+    else:
+        home.render_devices(out)
+
+def _batch_info(home, text, out):
+    out.write(home.display_info() + "\n")
+
+# Batch script verbs; each handler receives (home, rest_of_line, out)
+BATCH_COMMANDS = {
+    "add": _batch_add,
+    "remove": _batch_remove,
+    "control": _batch_control,
+    "automation": _batch_automation,
+    "mode": _batch_mode,
+    "list": _batch_list,
+    "info": _batch_info,
+}
+
+def run_batch(home, lines, out=None, stop_on_error=False):
+    """Execute a command script against ``home``, one command per line.
+    
+    Nothing is rendered between commands; only ``list`` and ``info`` write to
+    ``out``, as do errors ("line N: message"), which skip the failing line.
+    Blank lines and ``#`` comments are ignored. Returns ``(executed, failed)``.
+    """
+    out = sys.stdout if out is None else out
+    executed = failed = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        verb, _, rest = line.partition(" ")
+        try:
+            handler = BATCH_COMMANDS.get(verb)
+            if handler is None:
+                raise InvalidInputException(f"Unknown command: {verb}")
+            handler(home, rest, out)
+            executed += 1
+        except Exception as e:
+            failed += 1
+            out.write(f"line {number}: {e}\n")
+            if stop_on_error:
+                break
+    return executed, failed
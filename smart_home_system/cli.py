@@ -0,0 +1,198 @@
+"""
+Smart Home System - Command-line entry point: interactive menu, batch and server modes.
+"""
+import argparse
+import sys
+import time
+from .core import (Camera, DeviceNotFoundException, InvalidInputException, Light, MotionSensor, SmartHome,
+                   Thermostat, device_type)
+from .batch import run_batch
+
+def _initial_home(args):
+    """Return the home for --batch/--serve: loaded from --load, or empty."""
+    if args.load:
+        with open(args.load, encoding="utf-8") as stream:
+            return SmartHome.load(stream)
+    return SmartHome("My Smart Home")
+
+def _batch_main(args):
+    """Run ``--batch`` mode and report throughput on stderr."""
+    home = _initial_home(args)
+    script = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        executed, failed = run_batch(home, script, stop_on_error=args.stop_on_error)
+    finally:
+        if script is not sys.stdin:
+            script.close()
+    elapsed = time.perf_counter() - start
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as stream:
+            home.dump(stream)
+    rate = (executed + failed) / elapsed if elapsed else float("inf")
+    sys.stderr.write(f"Executed {executed} commands ({failed} failed) in {elapsed:.3f}s "
+                     f"({rate:,.0f} commands/s)\n")
+    return 1 if failed else 0
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Smart Home System")
+    parser.add_argument("--batch", metavar="SCRIPT",
+                        help="run a command script ('-' for stdin) instead of the interactive menu")
+    parser.add_argument("--load", metavar="FILE", help="start batch or server mode from a SmartHome.dump file")
+    parser.add_argument("--save", metavar="FILE", help="dump the home to FILE after batch mode")
+    parser.add_argument("--stop-on-error", action="store_true", help="stop batch mode at the first failure")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="serve the home over HTTP/JSON instead of the interactive menu")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Main function to run the smart home system.
+    
+    With ``--batch SCRIPT`` the commands in SCRIPT are executed instead of
+    showing the interactive menu (see ``run_batch``); ``--serve`` starts a
+    HomeServer instead.
+    """
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    if args.batch is not None:
+        return _batch_main(args)
+    if args.serve is not None:
+        # Only server mode pays for importing asyncio
+        import asyncio
+        from .server import HomeServer
+        host, _, port = args.serve.rpartition(":")
+        server = HomeServer(_initial_home(args), host or "127.0.0.1", int(port))
+        asyncio.run(server.serve_forever())
+        return 0
+    
+    # Create a smart home
+    my_home = SmartHome("My Smart Home")
+    
+    # Add some initial devices
+    try:
+        my_home.add_device(Light("L001", "Living Room Light", True, True, "Living Room", 80, "White"))
+        my_home.add_device(Thermostat("T001", "Main Thermostat", True, True, "Living Room", 22.5, "Heat", 23.0))
+        my_home.add_device(Light("L002", "Kitchen Light", False, True, "Kitchen", 100, "White"))
+        my_home.add_device(Light("L003", "Bedroom Light", False, True, "Bedroom", 60, "Warm White"))
+        my_home.add_device(Camera("C001", "Front Door Camera", True, True, "Front Door", "Armed", 80, "1080p", False))
+        my_home.add_device(MotionSensor("M001", "Backyard Sensor", True, True, "Backyard", "Armed", 60, 10, None))
+    except Exception as e:
+        print(f"Error setting up smart home: {e}")
+    
+    # Menu-based interaction
+    while True:
+        print("\n" + my_home.display_info())
+        
+        print("\nMenu:")
+        print("1. Add Device to Smart Home")
+        print("2. Control Device")
+        print("3. Run Automation Scenario")
+        print("4. Change Home Mode")
+        print("5. Display All Devices")
+        print("0. Exit")
+        
+        try:
+            choice = int(input("\nEnter your choice (0-5): "))
+            
+            if choice == 1:
+                # Add Device logic
+                type_choice = int(input("\nSelect device type (1-Light, 2-Thermostat, 3-Camera, 4-MotionSensor): "))
+                device_id = input("Enter device ID: ")
+                device_name = input("Enter device name: ")
+                is_on = input("Is device on? (y/n): ").lower() == 'y'
+                connected = input("Is device connected? (y/n): ").lower() == 'y'
+                location = input("Enter device location (room): ")
+                
+                try:
+                    if type_choice == 1:  # Light
+                        brightness = int(input("Enter brightness (0-100): "))
+                        color = input("Enter light color: ")
+                        device = Light(device_id, device_name, is_on, connected, location, brightness, color)
+                    elif type_choice == 2:  # Thermostat
+                        temperature = float(input("Enter current temperature (5-35): "))
+                        mode_choice = int(input("Select mode (1-Heat, 2-Cool, 3-Auto, 4-Off): "))
+                        mode_options = ["Heat", "Cool", "Auto", "Off"]
+                        mode = mode_options[mode_choice - 1]
+                        target_temp = float(input("Enter target temperature (5-35): "))
+                        device = Thermostat(device_id, device_name, is_on, connected, location, temperature, mode, target_temp)
+                    elif type_choice == 3:  # Camera
+                        armed_status = "Armed" if input("Is device armed? (y/n): ").lower() == 'y' else "Disarmed"
+                        sensitivity = int(input("Enter sensitivity (0-100): "))
+                        resolution = input("Enter camera resolution: ")
+                        recording = input("Is camera recording? (y/n): ").lower() == 'y'
+                        device = Camera(device_id, device_name, is_on, connected, location, armed_status, sensitivity, resolution, recording)
+                    elif type_choice == 4:  # Motion Sensor
+                        armed_status = "Armed" if input("Is device armed? (y/n): ").lower() == 'y' else "Disarmed"
+                        sensitivity = int(input("Enter sensitivity (0-100): "))
+                        detection_range = int(input("Enter detection range (meters): "))
+                        device = MotionSensor(device_id, device_name, is_on, connected, location, armed_status, sensitivity, detection_range, None)
+                    else:
+                        raise InvalidInputException("Invalid device type selected")
+                    
+                    if my_home.add_device(device):
+                        print(f"Device '{device_id}' added successfully.")
+                    else:
+                        print(f"Device with ID {device_id} already exists.")
+                
+                except Exception as e:
+                    print(f"Error adding device: {e}")
+            
+            elif choice == 2:
+                # Control Device logic
+                try:
+                    device_id = input("Enter device ID to control: ")
+                    device = my_home.find_device(device_id)
+                    print(f"\nSelected Device: {device.display_info()}")
+                    
+                    menu = device_type(type(device)).menu
+                    options = ", ".join(f"{n}-{label}" for n, (label, _) in enumerate(menu, 1))
+                    control_choice = int(input(f"\nOptions: {options}: "))
+                    if 1 <= control_choice <= len(menu):
+                        print(menu[control_choice - 1][1](device))
+                
+                except DeviceNotFoundException as e:
+                    print(f"Error: {e}")
+                except Exception as e:
+                    print(f"Error controlling device: {e}")
+            
+            elif choice == 3:
+                # Run Automation
+                automation_choice = int(input("\nSelect automation (1-Good Morning, 2-Good Night, 3-Away Mode): "))
+                try:
+                    automations = ["Good Morning", "Good Night", "Away Mode"]
+                    if 1 <= automation_choice <= 3:
+                        automation = automations[automation_choice - 1]
+                        if my_home.execute_automation(automation):
+                            print(f"'{automation}' automation executed")
+                    else:
+                        print("Invalid automation choice")
+                except Exception as e:
+                    print(f"Error executing automation: {e}")
+            
+            elif choice == 4:
+                # Change Home Mode
+                mode_choice = int(input("\nSelect mode (1-Home, 2-Away, 3-Night, 4-Vacation): "))
+                try:
+                    mode_options = ["Home", "Away", "Night", "Vacation"]
+                    if 1 <= mode_choice <= 4:
+                        new_mode = my_home.change_mode(mode_options[mode_choice - 1])
+                        print(f"Home mode changed to {new_mode}")
+                    else:
+                        print("Invalid mode choice")
+                except Exception as e:
+                    print(f"Error changing mode: {e}")
+            
+            elif choice == 5:
+                # Display All Devices
+                print("\nAll Devices:")
+                my_home.render_devices(sys.stdout)
+            
+            elif choice == 0:
+                # Exit
+                print("Thank you for using the Smart Home System!")
+                break
+            
+            else:
+                print("Invalid choice. Please enter a number between 0 and 5.")
+        
+        except Exception as e:
+            print(f"An error occurred: {e}")
@@ -0,0 +1,1575 @@
+"""
+Smart Home System - Core device classes, registry and SmartHome hub.
+"""
+import gc
+import sys
+import threading
+from collections.abc import Sequence
+from contextlib import contextmanager
+from itertools import chain
+from operator import attrgetter, itemgetter
+
+class DeviceNotFoundException(Exception):
+    """Exception raised when a device is not found in the smart home."""
+    pass
+
+class InvalidInputException(Exception):
+    """Exception raised when invalid input is provided."""
+    pass
+
+# Per-class attribute getters used by Device.to_dict and state snapshots
+_FIELD_GETTERS = {}
+
+def _field_getter(cls):
+    getter = _FIELD_GETTERS.get(cls)
+    if getter is None:
+        getter = _FIELD_GETTERS[cls] = attrgetter(*["_" + field for field in cls.FIELDS])
+    return getter
+
+# Thermostat mode codes used in EnergyEstimator rows; 0 means no HVAC load
+_HVAC_MODE_CODES = {"Heat": 1.0, "Cool": 2.0, "Auto": 3.0}
+
+def _intern(value):
+    """Return the canonical copy of a string so equal values share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+class SymbolTable:
+    """Two-way mapping between interned attribute values and compact integer codes."""
+    def __init__(self, symbols=()):
+        self.symbols = []
+        self.codes = {}
+        for symbol in symbols:
+            self.code(symbol)
+    
+    def code(self, value):
+        """Return the code for ``value``, assigning the next free one if it is new."""
+        code = self.codes.get(value)
+        if code is None:
+            value = _intern(value)
+            code = self.codes[value] = len(self.symbols)
+            self.symbols.append(value)
+        return code
+    
+    def symbol(self, code):
+        return self.symbols[code]
+
+class Schema:
+    """Precompiled validation rules for device fields.
+    
+    ``rules`` is a sequence of ``(field, kind, allowed, message)``: kind "text"
+    requires a non-empty string, "range" a value within ``allowed = (low,
+    high)``, and "choice" a member of ``allowed`` (stored as a frozenset).
+    Rules of ``base`` come first. The same schema validates single values in
+    constructors and setters and whole batches of raw records.
+    """
+    def __init__(self, rules, base=None):
+        self.rules = dict(base.rules) if base is not None else {}
+        for field, kind, allowed, message in rules:
+            self.rules[field] = (kind, frozenset(allowed) if kind == "choice" else allowed, message)
+    
+    def check(self, field, value):
+        """Return ``value``, or raise InvalidInputException if it breaks the rule for ``field``."""
+        kind, allowed, message = self.rules[field]
+        try:
+            if kind == "range":
+                valid = allowed[0] <= value <= allowed[1]
+            elif kind == "choice":
+                valid = value in allowed
+            else:
+                valid = isinstance(value, str) and value != ""
+        except TypeError:
+            valid = False
+        if not valid:
+            raise InvalidInputException(message)
+        return value
+    
+    def __valid(self, field, value):
+        try:
+            self.check(field, value)
+        except InvalidInputException:
+            return False
+        return True
+    
+    def validate_batch(self, records):
+        """Validate a sequence of record dicts and return one list of error messages per row.
+        
+        Numeric ranges are checked column-wise with NumPy when it is installed.
+        """
+        failures = self._failures(records)
+        return [failures.get(row, []) for row in range(len(records))]
+    
+    def _failures(self, records):
+        """Map the row number of each invalid record to its error messages."""
+        errors = {}
+        try:
+            np = _numpy()
+        except ImportError:
+            np = None
+        for field, (kind, allowed, message) in self.rules.items():
+            values = [record.get(field, _MISSING) for record in records]
+            if kind == "range" and np is not None:
+                column = np.asarray(values)
+                if column.ndim == 1 and column.dtype.kind in "biuf":
+                    low, high = allowed
+                    for row in np.flatnonzero(~((column >= low) & (column <= high))).tolist():
+                        errors.setdefault(row, []).append(message)
+                    continue
+            try:
+                if kind == "choice":
+                    bad = [row for row, value in enumerate(values) if value not in allowed]
+                elif kind == "text":
+                    bad = [row for row, value in enumerate(values) if not (isinstance(value, str) and value)]
+                else:
+                    raise TypeError
+            except TypeError:
+                bad = [row for row, value in enumerate(values) if not self.__valid(field, value)]
+            for row in bad:
+                errors.setdefault(row, []).append(f"Missing device field: {field}" if values[row] is _MISSING else message)
+        return errors
+
+# Placeholder for absent fields in Schema.validate_batch
+_MISSING = object()
+
+class Device:
+    """Base class representing any device in the smart home system."""
+    device_count = 0
+    # A device only uncounts itself in the epoch it was counted in (see reset_device_count)
+    _count_epoch = 0
+    _counted_in = None
+    _count_lock = threading.RLock()
+    # Constructor arguments in order; each is stored as a protected attribute
+    FIELDS = ("id", "name", "is_on", "connected", "location")
+    # Power model in watts: STANDBY_WATTS when off, otherwise ON_WATTS plus
+    # VARIABLE_WATTS scaled by the 0-1 load reported by _load()
+    STANDBY_WATTS = 0.5
+    ON_WATTS = 2.0
+    VARIABLE_WATTS = 0.0
+    SCHEMA = Schema([("id", "text", None, "Device ID must be non-empty string")])
+    # Low-cardinality FIELDS: interned on assignment; SmartHome.dump(symbols=True)
+    # stores them as SymbolTable codes
+    INTERNED = ("location",)
+    
+    def __init__(self, id, name, is_on, connected, location):
+        self._id = self.SCHEMA.check("id", id)
+        self._name = name
+        self._is_on = is_on
+        self._connected = connected
+        self._location = _intern(location)
+        self._init_runtime()
+        with Device._count_lock:
+            Device.device_count += 1
+            self._counted_in = Device._count_epoch
+    
+    def _init_runtime(self):
+        """Set the attributes that are not FIELDS (caches, observers, counters)."""
+        self._info_cache = None
+        self._observers = []
+    
+    def __del__(self):
+        # Devices whose constructor failed before counting them are skipped
+        with Device._count_lock:
+            if self._counted_in == Device._count_epoch:
+                Device.device_count -= 1
+    
+    @classmethod
+    def reset_device_count(cls):
+        """Restart ``device_count`` at zero; devices created before no longer change it."""
+        with Device._count_lock:
+            Device._count_epoch += 1
+            Device.device_count = 0
+    
+    @property
+    def id(self): return self._id
+    @property
+    def name(self): return self._name
+    @property
+    def is_on(self): return self._is_on
+    @property
+    def connected(self): return self._connected
+    @property
+    def location(self): return self._location
+    
+    def to_dict(self):
+        """Return the device as a plain dict tagged with its class name."""
+        cls = type(self)
+        data = {"type": cls.__name__}
+        data.update(zip(cls.FIELDS, _field_getter(cls)(self)))
+        return data
+    
+    @classmethod
+    def validate_records(cls, records):
+        """Validate raw device records in bulk; returns a list of error messages per row.
+        
+        Rows are grouped by their ``type`` and each group is checked against
+        its class SCHEMA in one pass.
+        """
+        groups, errors = cls._validate_groups(records)
+        for device_class, rows, group in groups:
+            required = {field for field in device_class.FIELDS if field not in device_class.SCHEMA.rules}
+            for row in [row for row, record in zip(rows, group) if not record.keys() >= required]:
+                errors.setdefault(row, []).extend(cls._missing_fields(device_class, records[row], required))
+        return [errors.get(row, []) for row in range(len(records))]
+    
+    @classmethod
+    def _validate_groups(cls, records):
+        """Check every SCHEMA rule; returns ``([(device_class, rows, records)], {row: errors})``."""
+        errors = {}
+        groups = {}
+        default = cls.__name__
+        for row, name in enumerate([record.get("type", default) for record in records]):
+            groups.setdefault(name, []).append(row)
+        checked = []
+        for name, rows in groups.items():
+            device_class = DEVICE_TYPES.get(name)
+            if device_class is None or not issubclass(device_class, cls):
+                for row in rows:
+                    errors[row] = [f"Unknown device type: {records[row].get('type')}"]
+                continue
+            group = [records[row] for row in rows]
+            for index, row_errors in device_class.SCHEMA._failures(group).items():
+                errors[rows[index]] = row_errors
+            checked.append((device_class, rows, group))
+        return checked, errors
+    
+    @staticmethod
+    def _missing_fields(device_class, record, required):
+        return [f"Missing device field: {field}" for field in device_class.FIELDS
+                if field in required and field not in record]
+    
+    @classmethod
+    def from_records(cls, records):
+        """Build devices from raw records, skipping invalid rows.
+        
+        Returns ``(devices, errors)`` where ``errors`` maps row number to its
+        error messages. Rows that pass validation are built without running
+        the constructors' checks again (see ``_validated_builder``).
+        """
+        records = list(records)
+        groups, failures = cls._validate_groups(records)
+        built = [None] * len(records)
+        uncounted = []
+        # Nothing built here is garbage, so pause cyclic GC passes over the growing batch
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for device_class, rows, group in groups:
+                build = device_class._validated_builder()
+                required = {field for field in device_class.FIELDS if field not in device_class.SCHEMA.rules}
+                for row, record in zip(rows, group):
+                    if row in failures:
+                        failures[row].extend(cls._missing_fields(device_class, record, required))
+                        continue
+                    try:
+                        if build is None:
+                            built[row] = device_class(*[record[field] for field in device_class.FIELDS])
+                        else:
+                            built[row] = device = build(record)
+                            uncounted.append(device)
+                    except KeyError:
+                        failures[row] = cls._missing_fields(device_class, record, required)
+        finally:
+            if collecting:
+                gc.enable()
+        with Device._count_lock:
+            Device.device_count += len(uncounted)
+            epoch = Device._count_epoch
+            for device in uncounted:
+                device._counted_in = epoch
+        return [device for device in built if device is not None], failures
+    
+    @classmethod
+    def _validated_builder(cls):
+        """Return a function building a device from a record whose fields passed SCHEMA, or None.
+        
+        Built-in constructors only check SCHEMA and intern INTERNED fields, so
+        the function assigns attributes directly instead of checking again and
+        leaves counting the device to the caller; a missing field raises
+        KeyError. Classes with their own constructor elsewhere get None.
+        """
+        if cls.__init__.__module__ != __name__:
+            return None
+        values = itemgetter(*cls.FIELDS)
+        attributes = ["_" + field for field in cls.FIELDS]
+        interned = ["_" + field for field in cls.INTERNED]
+        new = cls.__new__
+        
+        def build(record):
+            device = new(cls)
+            state = device.__dict__
+            state.update(zip(attributes, values(record)))
+            for attribute in interned:
+                state[attribute] = _intern(state[attribute])
+            device._init_runtime()
+            return device
+        return build
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a device from ``to_dict`` output, dispatching on its ``type``."""
+        device_class = DEVICE_TYPES.get(data.get("type", cls.__name__))
+        if device_class is None or not issubclass(device_class, cls):
+            raise InvalidInputException(f"Unknown device type: {data.get('type')}")
+        try:
+            args = [data[field] for field in device_class.FIELDS]
+        except KeyError as e:
+            raise InvalidInputException(f"Missing device field: {e.args[0]}")
+        return device_class(*args)
+    
+    def _get_state(self):
+        """Return the values of all FIELDS as a tuple."""
+        return _field_getter(type(self))(self)
+    
+    def _set_state(self, state):
+        """Restore values captured by ``_get_state``."""
+        for field, value in zip(self.FIELDS, state):
+            setattr(self, "_" + field, value)
+        self._changed()
+    
+    def add_observer(self, callback):
+        """Call ``callback(device)`` after every state change of this device."""
+        self._observers.append(callback)
+    
+    def remove_observer(self, callback):
+        self._observers.remove(callback)
+    
+    def _changed(self):
+        """Invalidate cached state derived from this device and notify observers."""
+        self._info_cache = None
+        for observer in self._observers:
+            observer(self)
+    
+    def toggle_power(self):
+        self._is_on = not self._is_on
+        self._changed()
+        return self._is_on
+    
+    def connect(self):
+        self._connected = True
+        self._changed()
+        return self._connected
+    
+    def disconnect(self):
+        self._connected = False
+        self._changed()
+        return self._connected
+    
+    def _load(self):
+        return 0.0
+    
+    def power_watts(self):
+        """Return the instantaneous power draw in watts."""
+        if not self._is_on:
+            return self.STANDBY_WATTS
+        return self.ON_WATTS + self.VARIABLE_WATTS * self._load()
+    
+    def _energy_row(self):
+        """Return this device's row for EnergyEstimator (see ENERGY_COLUMNS)."""
+        return (1.0 if self._is_on else 0.0, self.ON_WATTS, self.STANDBY_WATTS,
+                self.VARIABLE_WATTS, self._load(), 0.0, 0.0, 0.0)
+    
+    def display_info(self):
+        """Return the device description, rendering it only after a state change."""
+        if self._info_cache is None:
+            self._info_cache = self._render_info()
+        return self._info_cache
+    
+    def _render_info(self):
+        power = "On" if self._is_on else "Off"
+        conn = "Connected" if self._connected else "Disconnected"
+        return f"ID: {self._id} | {self._name} | {power} | {conn} | {self._location}"
+
+class Light(Device):
+    """Class representing light devices."""
+    FIELDS = Device.FIELDS + ("brightness", "color")
+    STANDBY_WATTS = 0.3
+    ON_WATTS = 0.0
+    VARIABLE_WATTS = 10.0
+    INTERNED = Device.INTERNED + ("color",)
+    SCHEMA = Schema([("brightness", "range", (0, 100), "Brightness must be between 0-100")], base=Device.SCHEMA)
+    
+    def __init__(self, id, name, is_on, connected, location, brightness, color):
+        super().__init__(id, name, is_on, connected, location)
+        self._brightness = self.SCHEMA.check("brightness", brightness)
+        self._color = _intern(color)
+    
+    @property
+    def brightness(self): return self._brightness
+    @property
+    def color(self): return self._color
+    
+    def dim(self, level):
+        self._brightness = self.SCHEMA.check("brightness", level)
+        self._changed()
+        return self._brightness
+    
+    def change_color(self, color):
+        self._color = _intern(color)
+        self._changed()
+        return self._color
+    
+    def _load(self):
+        return self._brightness / 100
+    
+    def _render_info(self):
+        return f"{super()._render_info()} | Brightness: {self._brightness}% | Color: {self._color}"
+
+class Thermostat(Device):
+    """Class representing thermostat devices."""
+    VALID_MODES = ["Heat", "Cool", "Auto", "Off"]
+    FIELDS = Device.FIELDS + ("temperature", "mode", "target_temp")
+    ON_WATTS = 3.0
+    VARIABLE_WATTS = 3000.0
+    # Temperature gap (°C) at which the HVAC runs at full duty
+    FULL_DUTY_DELTA = 5.0
+    INTERNED = Device.INTERNED + ("mode",)
+    SCHEMA = Schema([
+        ("temperature", "range", (5, 35), "Temperature must be between 5-35°C"),
+        ("mode", "choice", VALID_MODES, f"Mode must be one of {VALID_MODES}"),
+        ("target_temp", "range", (5, 35), "Target temperature must be between 5-35°C"),
+    ], base=Device.SCHEMA)
+    
+    def __init__(self, id, name, is_on, connected, location, temperature, mode, target_temp):
+        super().__init__(id, name, is_on, connected, location)
+        schema = self.SCHEMA
+        self._temperature = schema.check("temperature", temperature)
+        self._mode = _intern(schema.check("mode", mode))
+        self._target_temp = schema.check("target_temp", target_temp)
+    
+    @property
+    def temperature(self): return self._temperature
+    @property
+    def mode(self): return self._mode
+    @property
+    def target_temp(self): return self._target_temp
+    
+    def toggle_power(self):
+        self._is_on = not self._is_on
+        if not self._is_on:
+            self._mode = "Off"
+        self._changed()
+        return self._is_on
+    
+    def record_temperature(self, temperature):
+        """Record a new current (measured) temperature."""
+        self._temperature = self.SCHEMA.check("temperature", temperature)
+        self._changed()
+        return self._temperature
+    
+    def set_temperature(self, temperature):
+        # Same bounds as target_temp, reported with the setter's message
+        self._target_temp = self.SCHEMA.check("temperature", temperature)
+        self._changed()
+        return self._target_temp
+    
+    def change_mode(self, mode):
+        self._mode = _intern(self.SCHEMA.check("mode", mode))
+        if mode == "Off":
+            self._is_on = False
+        self._changed()
+        return self._mode
+    
+    def _load(self):
+        delta = self._target_temp - self._temperature
+        if self._mode == "Heat":
+            delta = max(delta, 0.0)
+        elif self._mode == "Cool":
+            delta = max(-delta, 0.0)
+        elif self._mode == "Auto":
+            delta = abs(delta)
+        else:
+            return 0.0
+        return min(delta / self.FULL_DUTY_DELTA, 1.0)
+    
+    def _energy_row(self):
+        # HVAC load is derived from the temperature columns by EnergyEstimator
+        return (1.0 if self._is_on else 0.0, self.ON_WATTS, self.STANDBY_WATTS, self.VARIABLE_WATTS,
+                0.0, self._temperature, self._target_temp, _HVAC_MODE_CODES.get(self._mode, 0.0))
+    
+    def _render_info(self):
+        return f"{super()._render_info()} | Current: {self._temperature}°C | Target: {self._target_temp}°C | Mode: {self._mode}"
+
+class SecurityDevice(Device):
+    """Base class representing security devices."""
+    FIELDS = Device.FIELDS + ("armed_status", "sensitivity")
+    INTERNED = Device.INTERNED + ("armed_status",)
+    SCHEMA = Schema([("sensitivity", "range", (0, 100), "Sensitivity must be between 0-100")], base=Device.SCHEMA)
+    
+    def __init__(self, id, name, is_on, connected, location, armed_status, sensitivity):
+        super().__init__(id, name, is_on, connected, location)
+        self._armed_status = _intern(armed_status)
+        self._sensitivity = self.SCHEMA.check("sensitivity", sensitivity)
+    
+    @property
+    def armed_status(self): return self._armed_status
+    @property
+    def sensitivity(self): return self._sensitivity
+    
+    def toggle_power(self):
+        self._is_on = not self._is_on
+        if not self._is_on:
+            self._armed_status = "Disarmed"
+        self._changed()
+        return self._is_on
+    
+    def arm(self):
+        if not self._is_on:
+            return self._armed_status
+        self._armed_status = "Armed"
+        self._changed()
+        return self._armed_status
+    
+    def disarm(self):
+        self._armed_status = "Disarmed"
+        self._changed()
+        return self._armed_status
+    
+    def _render_info(self):
+        return f"{super()._render_info()} | Status: {self._armed_status} | Sensitivity: {self._sensitivity}%"
+
+class Camera(SecurityDevice):
+    """Class representing camera devices."""
+    FIELDS = SecurityDevice.FIELDS + ("resolution", "recording")
+    INTERNED = SecurityDevice.INTERNED + ("resolution",)
+    ON_WATTS = 4.0
+    VARIABLE_WATTS = 3.0
+    
+    def __init__(self, id, name, is_on, connected, location, armed_status, sensitivity, resolution, recording):
+        super().__init__(id, name, is_on, connected, location, armed_status, sensitivity)
+        self._resolution = _intern(resolution)
+        self._recording = recording
+    
+    @property
+    def resolution(self): return self._resolution
+    @property
+    def recording(self): return self._recording
+    
+    def arm(self):
+        if not self._is_on:
+            return self._armed_status
+        self._armed_status = "Armed"
+        self._recording = True
+        self._changed()
+        return self._armed_status
+    
+    def disarm(self):
+        self._armed_status = "Disarmed"
+        self._recording = False
+        self._changed()
+        return self._armed_status
+    
+    def start_recording(self):
+        if not self._is_on:
+            return False
+        self._recording = True
+        self._changed()
+        return self._recording
+    
+    def stop_recording(self):
+        self._recording = False
+        self._changed()
+        return self._recording
+    
+    def _load(self):
+        return 1.0 if self._recording else 0.0
+    
+    def _render_info(self):
+        rec_status = "Recording" if self._recording else "Not Recording"
+        return f"{super()._render_info()} | Resolution: {self._resolution} | {rec_status}"
+
+class MotionSensor(SecurityDevice):
+    """Class representing motion sensor devices."""
+    FIELDS = SecurityDevice.FIELDS + ("detection_range", "last_triggered")
+    ON_WATTS = 0.5
+    
+    def __init__(self, id, name, is_on, connected, location, armed_status, sensitivity, detection_range, last_triggered):
+        super().__init__(id, name, is_on, connected, location, armed_status, sensitivity)
+        self._detection_range = detection_range
+        self._last_triggered = last_triggered
+    
+    def _init_runtime(self):
+        super()._init_runtime()
+        self._trigger_count = 0
+    
+    @property
+    def detection_range(self): return self._detection_range
+    @property
+    def last_triggered(self): return self._last_triggered
+    @property
+    def trigger_count(self): return self._trigger_count
+    
+    def detect_motion(self, timestamp=None):
+        if not self._is_on or self._armed_status != "Armed":
+            return None
+        self._last_triggered = timestamp
+        self._trigger_count += 1
+        self._changed()
+        return self._last_triggered
+    
+    def reset_trigger(self):
+        self._last_triggered = None
+        self._changed()
+        return self._last_triggered
+    
+    def _render_info(self):
+        trigger = f"Last Triggered: {self._last_triggered}" if self._last_triggered else "Never Triggered"
+        return f"{super()._render_info()} | Range: {self._detection_range}m | {trigger}"
+
+class DeviceType:
+    """Capabilities registered for a device class.
+    
+    ``commands`` maps a method name to the converters applied to its
+    arguments (None passes an argument through); ``menu`` lists interactive
+    ``(label, handler)`` actions, each handler returning the message to show;
+    ``scenes`` maps an automation name to the handler applied to each device,
+    usually a SceneTarget.
+    """
+    # Bumped by every registration so cached automation plans can tell they are stale
+    generation = 0
+    
+    def __init__(self, cls, commands, menu, scenes):
+        self.cls = cls
+        self.name = cls.__name__
+        self.commands = commands
+        self.menu = menu
+        self.scenes = scenes
+
+# Device class -> DeviceType; unregistered subclasses resolve to their nearest registered base
+DEVICE_REGISTRY = {}
+# Device class name -> class, for deserialization
+DEVICE_TYPES = {}
+
+def register_device_type(cls, commands=None, menu=None, scenes=None):
+    """Register ``cls``, extending the tables of its nearest registered base class."""
+    base = device_type(cls.__mro__[1]) if cls is not Device else None
+    registered = DeviceType(
+        cls,
+        {**(base.commands if base else {}), **(commands or {})},
+        (base.menu if base else []) + list(menu or []),
+        {**(base.scenes if base else {}), **(scenes or {})},
+    )
+    # Drop cached lookups for subclasses that resolved to an older entry
+    for known in [known for known, entry in DEVICE_REGISTRY.items() if entry.cls is not known]:
+        del DEVICE_REGISTRY[known]
+    DEVICE_REGISTRY[cls] = registered
+    DEVICE_TYPES[cls.__name__] = cls
+    DeviceType.generation += 1
+    return registered
+
+def device_type(cls):
+    """Return the DeviceType for a device class (constant-time after the first lookup)."""
+    entry = DEVICE_REGISTRY.get(cls)
+    if entry is None:
+        entry = next((DEVICE_REGISTRY[base] for base in cls.__mro__ if base in DEVICE_REGISTRY), None)
+        if entry is None:
+            raise InvalidInputException(f"Unregistered device type: {cls.__name__}")
+        DEVICE_REGISTRY[cls] = entry
+    return entry
+
+@contextmanager
+def isolated_registry():
+    """Undo device type registrations made inside the block by restoring both registries on exit."""
+    saved_registry, saved_types = dict(DEVICE_REGISTRY), dict(DEVICE_TYPES)
+    try:
+        yield
+    finally:
+        DEVICE_REGISTRY.clear()
+        DEVICE_REGISTRY.update(saved_registry)
+        DEVICE_TYPES.clear()
+        DEVICE_TYPES.update(saved_types)
+        DeviceType.generation += 1
+
+def _menu_toggle_power(device):
+    return f"Device is now {'On' if device.toggle_power() else 'Off'}"
+
+def _menu_connection(device):
+    if device.connected:
+        device.disconnect()
+        return "Device disconnected"
+    device.connect()
+    return "Device connected"
+
+def _menu_brightness(device):
+    brightness = int(input("Enter brightness (0-100): "))
+    device.dim(brightness)
+    return f"Brightness set to {brightness}%"
+
+def _menu_color(device):
+    color = input("Enter new color: ")
+    device.change_color(color)
+    return f"Color changed to {color}"
+
+def _menu_temperature(device):
+    temp = float(input("Enter target temperature (5-35): "))
+    device.set_temperature(temp)
+    return f"Temperature set to {temp}°C"
+
+def _menu_thermostat_mode(device):
+    mode_choice = int(input("Select mode (1-Heat, 2-Cool, 3-Auto, 4-Off): "))
+    mode_options = ["Heat", "Cool", "Auto", "Off"]
+    device.change_mode(mode_options[mode_choice - 1])
+    return f"Mode changed to {device.mode}"
+
+def _menu_arming(device):
+    if device.armed_status == "Armed":
+        device.disarm()
+        return "Device disarmed"
+    device.arm()
+    return "Device armed"
+
+def _menu_recording(device):
+    if device.recording:
+        device.stop_recording()
+        return "Recording stopped"
+    device.start_recording()
+    return "Recording started"
+
+def _menu_reset_trigger(device):
+    device.reset_trigger()
+    return "Trigger reset"
+
+# How a SceneTarget writes each attribute it can set; "is_on" is only written when it differs
+_TARGET_SETTERS = {
+    "is_on": lambda device, value: device.toggle_power(),
+    "connected": lambda device, value: device.connect() if value else device.disconnect(),
+    "brightness": lambda device, value: device.dim(value),
+    "color": lambda device, value: device.change_color(value),
+    "target_temp": lambda device, value: device.set_temperature(value),
+    "mode": lambda device, value: device.change_mode(value),
+    "armed_status": lambda device, value: device.arm() if value == "Armed" else device.disarm(),
+    "recording": lambda device, value: device.start_recording() if value else device.stop_recording(),
+}
+
+def _apply_desired(device, desired):
+    """Write the attributes of ``desired`` that differ on ``device``; returns ``(applied, skipped)``."""
+    applied = skipped = 0
+    for attribute, value in desired.items():
+        if getattr(device, attribute) == value:
+            skipped += 1
+        else:
+            _TARGET_SETTERS[attribute](device, value)
+            applied += 1
+    return applied, skipped
+
+class _AutomationPlan:
+    """The devices an automation concerns in one home, with their cached desired states."""
+    __slots__ = ("entries", "by_id", "attributes", "handlers")
+    
+    def __init__(self, entries):
+        # (device, scene, desired state or None for a plain handler)
+        self.entries = entries
+        self.by_id = {entry[0].id: entry for entry in entries}
+        self.attributes = sum(len(desired) for _, _, desired in entries if desired)
+        self.handlers = any(desired is None for _, _, desired in entries)
+
+class SceneTarget:
+    """Automation scene given as the state a device should end up in.
+    
+    ``desired`` is a dict of attribute values (applied in order) or a function
+    of the device returning one, or None to leave the device alone. It may
+    only depend on attributes that never change, such as type and location,
+    because SmartHome caches it per device. Calling the scene on a device
+    writes only the attributes that differ and returns ``(applied, skipped)``.
+    """
+    def __init__(self, desired):
+        self._desired = desired
+    
+    def desired(self, device):
+        return self._desired(device) if callable(self._desired) else self._desired
+    
+    def __call__(self, device):
+        desired = self.desired(device)
+        return _apply_desired(device, desired) if desired else (0, 0)
+
+def _light_good_morning(device):
+    # Turn on lights in bedrooms and kitchen
+    if device.location in ["Bedroom", "Kitchen"]:
+        return {"is_on": True, "brightness": 100 if device.location == "Kitchen" else 60}
+    return None
+
+def _light_good_night(device):
+    # Turn off all lights except hallway
+    if device.location == "Hallway":
+        return {"is_on": True, "brightness": 30}
+    return {"is_on": False}
+
+def _thermostat_scene(temperature, mode):
+    return SceneTarget({"is_on": True, "target_temp": temperature, "mode": mode})
+
+_lights_off = SceneTarget({"is_on": False})
+_security_arm = SceneTarget({"is_on": True, "armed_status": "Armed"})
+# Arming also restarts a camera's recording
+_camera_arm = SceneTarget({"is_on": True, "armed_status": "Armed", "recording": True})
+
+# Automation scenarios understood by SmartHome.execute_automation
+AUTOMATIONS = ("Good Morning", "Good Night", "Away Mode", "Vacation Mode")
+
+# Home mode -> automation run when the home switches to it, whatever the previous mode
+MODE_AUTOMATIONS = {"Home": "Good Morning", "Night": "Good Night", "Away": "Away Mode", "Vacation": "Vacation Mode"}
+
+register_device_type(
+    Device,
+    commands={"toggle_power": (), "connect": (), "disconnect": ()},
+    menu=[("Toggle Power", _menu_toggle_power), ("Connect/Disconnect", _menu_connection)],
+)
+register_device_type(
+    Light,
+    commands={"dim": (int,), "change_color": (str,)},
+    menu=[("Adjust Brightness", _menu_brightness), ("Change Color", _menu_color)],
+    scenes={"Good Morning": SceneTarget(_light_good_morning), "Good Night": SceneTarget(_light_good_night),
+            "Away Mode": _lights_off, "Vacation Mode": _lights_off},
+)
+register_device_type(
+    Thermostat,
+    commands={"set_temperature": (float,), "change_mode": (str,), "record_temperature": (float,)},
+    menu=[("Set Temperature", _menu_temperature), ("Change Mode", _menu_thermostat_mode)],
+    scenes={"Good Morning": _thermostat_scene(22, "Heat"), "Good Night": _thermostat_scene(18, "Heat"),
+            "Away Mode": _thermostat_scene(16, "Auto"), "Vacation Mode": _thermostat_scene(12, "Heat")},
+)
+register_device_type(
+    SecurityDevice,
+    commands={"arm": (), "disarm": ()},
+    menu=[("Arm/Disarm", _menu_arming)],
+    scenes={"Good Night": _security_arm, "Away Mode": _security_arm, "Vacation Mode": _security_arm},
+)
+register_device_type(
+    Camera,
+    commands={"start_recording": (), "stop_recording": ()},
+    menu=[("Start/Stop Recording", _menu_recording)],
+    scenes={"Good Night": _camera_arm, "Away Mode": _camera_arm, "Vacation Mode": _camera_arm},
+)
+register_device_type(
+    MotionSensor,
+    commands={"detect_motion": (None,), "reset_trigger": ()},
+    menu=[("Reset Trigger", _menu_reset_trigger)],
+)
+
+class _DeviceChunks(Sequence):
+    """Immutable device sequence stored as a tuple of tuple chunks.
+    
+    ``appended`` and ``removed`` return a new sequence that copies only the
+    touched chunk and the (short) tuple of chunks, sharing every other chunk.
+    Chunk numbers stay stable until the sequence is rebuilt.
+    """
+    __slots__ = ("_chunks", "_length")
+    CHUNK_SIZE = 512
+    
+    def __init__(self, chunks=(), length=0):
+        self._chunks = chunks
+        self._length = length
+    
+    @classmethod
+    def from_devices(cls, devices):
+        devices = tuple(devices)
+        size = cls.CHUNK_SIZE
+        return cls(tuple(devices[start:start + size] for start in range(0, len(devices), size)), len(devices))
+    
+    def __len__(self):
+        return self._length
+    
+    def __iter__(self):
+        return chain.from_iterable(self._chunks)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("device index out of range")
+        for chunk in self._chunks:
+            if index < len(chunk):
+                return chunk[index]
+            index -= len(chunk)
+    
+    def __eq__(self, other):
+        if not isinstance(other, (tuple, _DeviceChunks)):
+            return NotImplemented
+        return len(self) == len(other) and tuple(self) == tuple(other)
+    
+    __hash__ = None
+    
+    def appended(self, device):
+        """Return ``(sequence with device at the end, number of the chunk holding it)``."""
+        chunks = self._chunks
+        if chunks and len(chunks[-1]) < self.CHUNK_SIZE:
+            return _DeviceChunks(chunks[:-1] + (chunks[-1] + (device,),), self._length + 1), len(chunks) - 1
+        return _DeviceChunks(chunks + ((device,),), self._length + 1), len(chunks)
+    
+    def removed(self, device, number):
+        """Return the sequence without ``device``, which sits in chunk ``number``."""
+        chunk = self._chunks[number]
+        position = chunk.index(device)
+        chunk = chunk[:position] + chunk[position + 1:]
+        return _DeviceChunks(self._chunks[:number] + (chunk,) + self._chunks[number + 1:], self._length - 1)
+    
+    def sparse(self):
+        """True once removals have left many more chunks than the devices need."""
+        return len(self._chunks) > 2 * (self._length // self.CHUNK_SIZE) + 2
+
+_NO_DEVICES = _DeviceChunks()
+
+class HomeSnapshot:
+    """Immutable view of a SmartHome's devices, rooms and mode at one moment.
+    
+    Writers publish a new snapshot with every membership or mode change. It
+    shares unchanged device chunks, including those of each room, with the
+    previous one.
+    Device objects are shared with the live home, so their own state is
+    always current; the snapshot fixes which devices exist, where, and the
+    home mode.
+    """
+    __slots__ = ("_name", "_mode", "_devices", "_rooms", "_index")
+    
+    def __init__(self, name, mode, devices, rooms):
+        self._name = name
+        self._mode = mode
+        self._devices = devices
+        self._rooms = rooms
+        self._index = None
+    
+    @property
+    def name(self): return self._name
+    @property
+    def mode(self): return self._mode
+    @property
+    def devices(self): return self._devices
+    @property
+    def rooms(self): return frozenset(self._rooms)
+    
+    def get_devices_by_room(self, room):
+        return self._rooms.get(room, ())
+    
+    def get_devices_by_type(self, device_class):
+        return tuple(d for d in self._devices if isinstance(d, device_class))
+    
+    def find_device(self, device_id):
+        if self._index is None:
+            self._index = {d.id: d for d in self._devices}
+        device = self._index.get(device_id)
+        if device is not None:
+            return device
+        raise DeviceNotFoundException(f"Device with ID {device_id} not found")
+    
+    def display_info(self):
+        output = []
+        output.append("===== SMART HOME SYSTEM =====")
+        output.append(f"Home: {self._name}")
+        output.append(f"Mode: {self._mode}")
+        output.append(f"Total Devices: {len(self._devices)}")
+        output.append("Devices by Room:")
+        for room in sorted(self._rooms):
+            output.append(f"  {room}: {len(self._rooms[room])}")
+        connected_count = sum(1 for d in self._devices if d.connected)
+        output.append(f"Connected Devices: {connected_count}/{len(self._devices)}")
+        return "\n".join(output)
+
+class _NullLock:
+    """Stand-in for threading.RLock when a SmartHome is used from one thread."""
+    def acquire(self, *args): return True
+    def release(self): pass
+    def __enter__(self): return True
+    def __exit__(self, *exc_info): pass
+
+_NULL_LOCK = _NullLock()
+
+class SmartHome:
+    """Class representing a smart home system.
+    
+    With ``thread_safe=True`` membership changes take a home lock, device
+    commands issued through ``control`` take one of ``lock_stripes`` locks
+    chosen by device ID, and transactions hold all of them. Lookups and
+    queries take no locks: they read the ID-keyed device dict directly or
+    iterate an atomic copy of its values.
+    """
+    VALID_MODES = ["Home", "Away", "Night", "Vacation"]
+    
+    def __init__(self, name, thread_safe=False, lock_stripes=16):
+        self.__name = name
+        # Device ID -> device, in insertion order
+        self.__devices = {}
+        self.__rooms = set()
+        self.__room_counts = {}
+        # SecurityDevices keyed by (armed_status, is_on), and each one's current key
+        self.__security = {}
+        self.__security_keys = {}
+        # IDs of connected devices, kept in step with device changes
+        self.__connected = set()
+        # Automation name -> cached plan, and the registry generation it was built for
+        self.__plans = {}
+        self.__plans_generation = DeviceType.generation
+        # Automation whose plan was last applied in full, and IDs of devices changed since
+        self.__settled = None
+        self.__drift = set()
+        self.__mode = "Home"
+        self.__listeners = []
+        # Events held back while a transaction is open; None outside transactions
+        self.__pending = None
+        # (device, state) pairs restored on rollback; writers in a transaction may add to it
+        self.__undo = None
+        # Published snapshot, replaced by writers; device ID -> (its chunk in the snapshot's devices, in its room's devices)
+        self.__snapshot = HomeSnapshot(name, self.__mode, _DeviceChunks(), {})
+        self.__chunk_of = {}
+        # Set while __add_all adds many devices and publishes them once at the end
+        self.__deferred_publish = False
+        if thread_safe:
+            self.__lock = threading.RLock()
+            self.__event_lock = threading.RLock()
+            self.__stripes = [threading.RLock() for _ in range(lock_stripes)]
+        else:
+            self.__lock = self.__event_lock = _NULL_LOCK
+            self.__stripes = [_NULL_LOCK]
+    
+    @property
+    def name(self): return self.__name
+    @property
+    def mode(self): return self.__mode
+    @property
+    def devices(self): return list(self.__devices.values())
+    @property
+    def rooms(self): return self.__rooms.copy()
+    @property
+    def connected_count(self): return len(self.__connected)
+    
+    def add_device(self, device):
+        if not isinstance(device, Device):
+            raise InvalidInputException("Can only add Device objects")
+        with self.__lock:
+            if device.id in self.__devices:
+                return False
+            self.__devices[device.id] = device
+            self.__forget_plans()
+            self.__count_room(device.location, 1)
+            if device.connected:
+                self.__connected.add(device.id)
+            if isinstance(device, SecurityDevice):
+                self.__index_security(device)
+            self.__publish_added(device)
+            device.add_observer(self.__on_device_changed)
+            self.__notify("added", device)
+        return True
+    
+    def remove_device(self, device_id):
+        with self.__lock:
+            device = self.__devices.pop(device_id, None)
+            if device is None:
+                return False
+            self.__count_room(device.location, -1)
+            self.__forget_plans()
+            self.__connected.discard(device.id)
+            self.__unindex_security(device)
+            self.__publish_removed(device)
+            device.remove_observer(self.__on_device_changed)
+            self.__notify("removed", device)
+        return True
+    
+    def __count_room(self, room, delta):
+        count = self.__room_counts.get(room, 0) + delta
+        if count:
+            self.__room_counts[room] = count
+            self.__rooms.add(room)
+        else:
+            self.__room_counts.pop(room, None)
+            self.__rooms.discard(room)
+    
+    def __index_security(self, device):
+        self.__unindex_security(device)
+        key = (device.armed_status, device.is_on)
+        self.__security.setdefault(key, {})[device.id] = device
+        self.__security_keys[device.id] = key
+    
+    def __unindex_security(self, device):
+        key = self.__security_keys.pop(device.id, None)
+        if key is not None:
+            self.__security[key].pop(device.id, None)
+    
+    def get_security_devices(self, armed_status=None, is_on=None):
+        """Return the security devices with the given armed status and/or power state.
+        
+        Served from an index, so the cost depends on the number of security
+        devices rather than the size of the home.
+        """
+        devices = []
+        for (status, powered), group in tuple(self.__security.items()):
+            if (armed_status is None or status == armed_status) and (is_on is None or powered == is_on):
+                devices.extend(tuple(group.values()))
+        return devices
+    
+    def security_sweep(self, action="report"):
+        """Arm, disarm or report on all security devices and return the ones affected.
+        
+        "report" returns the devices that are disarmed or off without changing
+        them, "arm" powers those on and arms them, and "disarm" disarms every
+        armed device. Changes run as one transaction.
+        """
+        if action == "disarm":
+            targets = self.get_security_devices(armed_status="Armed")
+        elif action in ("arm", "report"):
+            targets = [d for key, group in tuple(self.__security.items()) if key != ("Armed", True)
+                       for d in tuple(group.values())]
+            if action == "report":
+                return targets
+        else:
+            raise InvalidInputException(f"Unknown security sweep action: {action}")
+        with self.transaction(targets):
+            for device in targets:
+                if action == "arm":
+                    _security_arm(device)
+                else:
+                    device.disarm()
+        return targets
+    
+    def snapshot(self):
+        """Return an immutable HomeSnapshot of the current membership and mode.
+        
+        Writers publish snapshots, so this is a plain attribute read: no lock
+        and no copying. Repeated calls without intervening writes return the
+        same object.
+        """
+        return self.__snapshot
+    
+    # Writers build the next snapshot from the current one, copying only the
+    # touched device chunk and room tuple, then publish it with one assignment.
+    def __publish_added(self, device):
+        if self.__deferred_publish:
+            return
+        current = self.__snapshot
+        devices, number = current._devices.appended(device)
+        rooms = dict(current._rooms)
+        rooms[device.location], room_number = rooms.get(device.location, _NO_DEVICES).appended(device)
+        self.__chunk_of[device.id] = (number, room_number)
+        self.__snapshot = HomeSnapshot(self.__name, self.__mode, devices, rooms)
+    
+    def __publish_removed(self, device):
+        current = self.__snapshot
+        number, room_number = self.__chunk_of.pop(device.id)
+        devices = current._devices.removed(device, number)
+        rooms = dict(current._rooms)
+        group = rooms[device.location].removed(device, room_number)
+        if group:
+            rooms[device.location] = group
+        else:
+            del rooms[device.location]
+        if devices.sparse() or group.sparse():
+            self.__publish_all()
+        else:
+            self.__snapshot = HomeSnapshot(self.__name, self.__mode, devices, rooms)
+    
+    def __publish_mode(self):
+        current = self.__snapshot
+        self.__snapshot = HomeSnapshot(self.__name, self.__mode, current._devices, current._rooms)
+    
+    def __publish_all(self):
+        # O(n): only for rollbacks and repacking a sequence left sparse by removals
+        size = _DeviceChunks.CHUNK_SIZE
+        devices = _DeviceChunks.from_devices(self.__devices.values())
+        rooms = {}
+        room_positions = {}
+        for device in devices:
+            group = rooms.setdefault(device.location, [])
+            room_positions[device.id] = len(group) // size
+            group.append(device)
+        self.__chunk_of = {device.id: (position // size, room_positions[device.id])
+                           for position, device in enumerate(devices)}
+        self.__snapshot = HomeSnapshot(self.__name, self.__mode, devices,
+                                       {room: _DeviceChunks.from_devices(group) for room, group in rooms.items()})
+    
+    def device_lock(self, device_id):
+        """Return the lock guarding commands for ``device_id``."""
+        return self.__stripes[hash(device_id) % len(self.__stripes)]
+    
+    def control(self, device_id, command, *args):
+        """Run a registered device command under the device's lock and return its result.
+        
+        Arguments are converted as declared in the device type's command table.
+        """
+        device = self.find_device(device_id)
+        converters = device_type(type(device)).commands.get(command)
+        if converters is None:
+            raise InvalidInputException(f"Unsupported command for {type(device).__name__}: {command}")
+        if len(args) > len(converters):
+            raise InvalidInputException(f"Too many arguments for {command}")
+        try:
+            args = [arg if convert is None else convert(arg) for convert, arg in zip(converters, args)]
+        except (TypeError, ValueError):
+            raise InvalidInputException(f"Invalid arguments for {command}: {args}")
+        with self.device_lock(device_id):
+            return getattr(device, command)(*args)
+    
+    def subscribe(self, callback):
+        """Call ``callback(event, subject)`` on home events.
+        
+        Events are "added", "removed" and "changed" (subject is the device) and
+        "mode" (subject is the new mode). Inside a transaction they are delivered
+        once on commit, with each changed device reported a single time.
+        """
+        self.__listeners.append(callback)
+    
+    def unsubscribe(self, callback):
+        self.__listeners.remove(callback)
+    
+    def __notify(self, event, subject):
+        if self.__pending is not None:
+            self.__pending.append((event, subject))
+            return
+        with self.__event_lock:
+            for listener in self.__listeners:
+                listener(event, subject)
+    
+    def __on_device_changed(self, device):
+        if self.__settled is not None:
+            self.__drift.add(device.id)
+        if device.connected:
+            self.__connected.add(device.id)
+        else:
+            self.__connected.discard(device.id)
+        if device.id in self.__security_keys:
+            self.__index_security(device)
+        self.__notify("changed", device)
+    
+    @contextmanager
+    def transaction(self, devices=None):
+        """Apply a group of changes atomically.
+        
+        Device states, membership and mode are captured on entry. If the block
+        raises, everything is restored and no events are published; otherwise
+        the collected events are published in one pass. Nested transactions
+        join the outermost one. Passing ``devices`` limits capture (and
+        rollback) to those devices' states and the mode, for blocks known to
+        change nothing else.
+        """
+        with self.__lock:
+            for stripe in self.__stripes:
+                stripe.acquire()
+            try:
+                if self.__pending is not None:
+                    yield self
+                else:
+                    yield from self.__run_transaction(devices)
+            finally:
+                for stripe in reversed(self.__stripes):
+                    stripe.release()
+    
+    def __run_transaction(self, devices=None):
+        # A scoped transaction captures only the given devices and leaves membership alone
+        saved_devices = dict(self.__devices) if devices is None else None
+        saved_states = [(d, d._get_state()) for d in (self.__devices.values() if devices is None else devices)]
+        saved_mode = self.__mode
+        self.__pending = []
+        self.__undo = saved_states
+        try:
+            yield self
+        except BaseException:
+            # Restore while events are still being held back, then drop them
+            if saved_devices is not None:
+                for device in set(self.__devices.values()).difference(saved_devices.values()):
+                    device.remove_observer(self.__on_device_changed)
+                for device in set(saved_devices.values()).difference(self.__devices.values()):
+                    device.add_observer(self.__on_device_changed)
+                self.__devices = saved_devices
+                self.__forget_plans()
+                self.__room_counts = {}
+                self.__rooms = set()
+                for device in saved_devices.values():
+                    self.__count_room(device.location, 1)
+            # Newest first, so the earliest capture of a device wins
+            for device, state in reversed(saved_states):
+                if device._get_state() != state:
+                    device._set_state(state)
+            if saved_devices is not None:
+                self.__security = {}
+                self.__security_keys = {}
+                self.__connected = {device.id for device in saved_devices.values() if device.connected}
+                for device in saved_devices.values():
+                    if isinstance(device, SecurityDevice):
+                        self.__index_security(device)
+            self.__mode = saved_mode
+            self.__settled = None
+            if saved_devices is not None:
+                self.__publish_all()
+            else:
+                self.__publish_mode()
+            self.__pending = self.__undo = None
+            raise
+        self.__undo = None
+        pending, self.__pending = self.__pending, None
+        seen = set()
+        for event, subject in pending:
+            if event == "changed":
+                if id(subject) in seen:
+                    continue
+                seen.add(id(subject))
+            self.__notify(event, subject)
+    
+    def get_devices_by_type(self, device_class):
+        return [d for d in tuple(self.__devices.values()) if isinstance(d, device_class)]
+    
+    def get_devices_by_room(self, room):
+        # Locations are interned, so matching devices compare by identity
+        room = _intern(room)
+        return [d for d in tuple(self.__devices.values()) if d.location == room]
+    
+    def find_device(self, device_id):
+        device = self.__devices.get(device_id)
+        if device is not None:
+            return device
+        raise DeviceNotFoundException(f"Device with ID {device_id} not found")
+    
+    def execute_automation(self, automation_name):
+        """Run a named scenario as a single transaction; returns False for unknown names."""
+        if automation_name not in AUTOMATIONS:
+            return False
+        self.run_automation(automation_name)
+        return True
+    
+    def run_automation(self, automation_name):
+        """Run a named scenario and return the ``(applied, skipped)`` attribute writes.
+        
+        Devices are compared with the scenario's desired state and only the
+        attributes that differ are written, so re-running a scenario on a
+        settled home writes nothing.
+        """
+        if automation_name not in AUTOMATIONS:
+            raise InvalidInputException(f"Unknown automation: {automation_name}")
+        with self.transaction(devices=()):
+            return self.__run_plan(automation_name)
+    
+    def __plan(self, automation_name):
+        # Devices the automation concerns, with their cached desired state (None for plain handlers)
+        if self.__plans_generation != DeviceType.generation:
+            self.__forget_plans()
+            self.__plans_generation = DeviceType.generation
+        plan = self.__plans.get(automation_name)
+        if plan is None:
+            entries = []
+            for device in self.__devices.values():
+                scene = device_type(type(device)).scenes.get(automation_name)
+                if isinstance(scene, SceneTarget):
+                    desired = scene.desired(device)
+                    if desired:
+                        entries.append((device, scene, desired))
+                elif scene is not None:
+                    entries.append((device, scene, None))
+            plan = self.__plans[automation_name] = _AutomationPlan(entries)
+        return plan
+    
+    def __forget_plans(self):
+        self.__plans = {}
+        self.__settled = None
+    
+    def __run_plan(self, automation_name):
+        plan = self.__plan(automation_name)
+        if self.__settled == automation_name and not plan.handlers:
+            # Nothing outside the drifted devices can differ from the last full run
+            entries = [plan.by_id[device_id] for device_id in self.__drift if device_id in plan.by_id]
+            applied, skipped = self.__apply_plan(entries)
+            skipped += plan.attributes - sum(len(desired) for _, _, desired in entries)
+        else:
+            applied, skipped = self.__apply_plan(plan.entries)
+        self.__settled = automation_name
+        self.__drift = set()
+        return applied, skipped
+    
+    def __apply_plan(self, entries):
+        # Inside a transaction, a device's state is captured for rollback just before its first write
+        undo = self.__undo
+        applied = skipped = 0
+        for device, scene, desired in entries:
+            if desired is None:
+                if undo is not None:
+                    undo.append((device, device._get_state()))
+                scene(device)
+                applied += 1
+                continue
+            captured = undo is None
+            for attribute, value in desired.items():
+                if getattr(device, attribute) == value:
+                    skipped += 1
+                    continue
+                if not captured:
+                    undo.append((device, device._get_state()))
+                    captured = True
+                _TARGET_SETTERS[attribute](device, value)
+                applied += 1
+        return applied, skipped
+    
+    def change_mode(self, mode):
+        """Switch the home mode and run the mode's automation in MODE_AUTOMATIONS.
+        
+        The automation follows a plan cached until devices are added or
+        removed, and only writes device attributes that differ from the plan.
+        """
+        if mode not in self.VALID_MODES:
+            raise InvalidInputException(f"Mode must be one of {self.VALID_MODES}")
+        with self.transaction(devices=()):
+            automation_name = MODE_AUTOMATIONS.get(mode)
+            self.__mode = mode
+            self.__publish_mode()
+            self.__notify("mode", mode)
+            if automation_name is not None:
+                self.__run_plan(automation_name)
+        return self.__mode
+    
+    def render_devices(self, stream=None, chunk_size=1024):
+        """Render every device on its own line.
+        
+        Uses each device's cached ``display_info``. When ``stream`` is given the
+        lines are written to it in chunks and the number of devices is returned;
+        otherwise the joined text is returned.
+        """
+        lines = [d.display_info() for d in tuple(self.__devices.values())]
+        if stream is None:
+            return "\n".join(lines)
+        for start in range(0, len(lines), chunk_size):
+            stream.write("\n".join(lines[start:start + chunk_size]))
+            stream.write("\n")
+        return len(lines)
+    
+    def to_dict(self):
+        return {"name": self.__name, "mode": self.__mode,
+                "devices": [d.to_dict() for d in tuple(self.__devices.values())]}
+    
+    @classmethod
+    def from_dict(cls, data):
+        home = cls(data["name"])
+        home.__restore_mode(data.get("mode", "Home"))
+        home.__add_all(Device.from_dict(device_data) for device_data in data.get("devices", []))
+        return home
+    
+    def __add_all(self, devices):
+        """add_device for each device, publishing one snapshot at the end instead of one per device."""
+        with self.__lock:
+            self.__deferred_publish = True
+            try:
+                for device in devices:
+                    self.add_device(device)
+            finally:
+                self.__deferred_publish = False
+                self.__publish_all()
+    
+    def __restore_mode(self, mode):
+        """Set the mode without running its automation (devices already hold the result)."""
+        if mode not in self.VALID_MODES:
+            raise InvalidInputException(f"Mode must be one of {self.VALID_MODES}")
+        self.__mode = mode
+        self.__publish_mode()
+    
+    def dump(self, stream, format="jsonl", chunk_size=1024, meta=None, symbols=False):
+        """Stream the home to ``stream``: a header record followed by one record per device.
+        
+        ``format`` is "jsonl" (text stream) or "msgpack" (binary stream, needs
+        the optional ``msgpack`` package). Returns the number of devices written.
+        With ``symbols`` each device's INTERNED fields are written as integer
+        codes into the ``symbols`` list carried by the header; this makes the
+        dump smaller but costs an extra pass over the devices. ``meta`` adds
+        fields to the header; ``load`` ignores them.
+        """
+        devices = tuple(self.__devices.values())
+        header = {"name": self.__name, "mode": self.__mode}
+        record = Device.to_dict
+        if symbols:
+            table = SymbolTable()
+            for d in devices:
+                for field in type(d).INTERNED:
+                    table.code(getattr(d, "_" + field))
+            header["symbols"] = table.symbols
+            record = _symbol_encoder(table.codes)
+        if meta:
+            header.update(meta)
+        if format == "jsonl":
+            import json  # Imported on use, like msgpack, to keep the core import light
+            encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+            stream.write(encode(header) + "\n")
+            for start in range(0, len(devices), chunk_size):
+                chunk = devices[start:start + chunk_size]
+                stream.write("\n".join([encode(record(d)) for d in chunk]))
+                stream.write("\n")
+        elif format == "msgpack":
+            packer = _msgpack().Packer()
+            stream.write(packer.pack(header))
+            for start in range(0, len(devices), chunk_size):
+                chunk = devices[start:start + chunk_size]
+                stream.write(b"".join([packer.pack(record(d)) for d in chunk]))
+        else:
+            raise InvalidInputException(f"Unsupported format: {format}")
+        return len(devices)
+    
+    @classmethod
+    def load(cls, stream, format="jsonl"):
+        """Rebuild a home written by ``dump``."""
+        if format == "jsonl":
+            import json
+            records = (json.loads(line) for line in stream if line.strip())
+        elif format == "msgpack":
+            records = iter(_msgpack().Unpacker(stream, raw=False))
+        else:
+            raise InvalidInputException(f"Unsupported format: {format}")
+        header = next(records, None)
+        if header is None:
+            raise InvalidInputException("Empty smart home stream")
+        home = cls(header["name"])
+        home.__restore_mode(header.get("mode", "Home"))
+        symbols = [_intern(symbol) for symbol in header.get("symbols", ())]
+        if symbols:
+            records = (_decode_symbols(record, symbols) for record in records)
+        home.__add_all(Device.from_dict(record) for record in records)
+        return home
+    
+    def power_watts(self):
+        """Return the total instantaneous power draw of all devices in watts."""
+        return sum(d.power_watts() for d in tuple(self.__devices.values()))
+    
+    def display_info(self):
+        output = []
+        output.append("===== SMART HOME SYSTEM =====")
+        output.append(f"Home: {self.__name}")
+        output.append(f"Mode: {self.__mode}")
+        output.append(f"Total Devices: {len(self.__devices)}")
+        output.append("Devices by Room:")
+        room_counts = dict(self.__room_counts)
+        for room in sorted(room_counts):
+            output.append(f"  {room}: {room_counts[room]}")
+        output.append(f"Connected Devices: {len(self.__connected)}/{len(self.__devices)}")
+        return "\n".join(output)
+
+def _symbol_encoder(codes):
+    """Return ``device -> record`` writing INTERNED fields as their ``codes`` entry."""
+    layouts = {}
+    
+    def record(device):
+        cls = type(device)
+        layout = layouts.get(cls)
+        if layout is None:
+            layout = layouts[cls] = (cls.__name__, _field_getter(cls),
+                                     [cls.FIELDS.index(field) for field in cls.INTERNED])
+        name, getter, positions = layout
+        values = list(getter(device))
+        for position in positions:
+            values[position] = codes[values[position]]
+        data = {"type": name}
+        data.update(zip(cls.FIELDS, values))
+        return data
+    return record
+
+def _decode_symbols(record, symbols):
+    """Replace the SymbolTable codes in a dumped device record with their values."""
+    device_class = DEVICE_TYPES.get(record.get("type"))
+    for field in device_class.INTERNED if device_class is not None else ():
+        if field in record:
+            record[field] = symbols[record[field]]
+    return record
+
+def _msgpack():
+    """Import the optional msgpack dependency on first use."""
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("MessagePack support requires the 'msgpack' package") from None
+    return msgpack
+
+def _numpy():
+    """Import the optional numpy dependency on first use."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Vectorized estimation requires the 'numpy' package") from None
+    return numpy
@@ -0,0 +1,110 @@
+"""
+Smart Home System - Vectorized energy estimation and thermostat simulation (requires numpy).
+"""
+from .core import Thermostat, _HVAC_MODE_CODES, _numpy
+
+class EnergyEstimator:
+    """Vectorized power and energy estimate for one or more homes.
+    
+    Device state is kept as a NumPy table with one row per device (columns in
+    ENERGY_COLUMNS). The estimator subscribes to each home and rewrites only
+    the row of a device that changed; membership changes trigger a rebuild on
+    the next query. Requires the optional ``numpy`` package.
+    """
+    ENERGY_COLUMNS = ("is_on", "on_watts", "standby_watts", "variable_watts",
+                      "load", "temperature", "target_temp", "hvac_mode")
+    
+    def __init__(self, *homes):
+        self._np = _numpy()
+        self._homes = homes
+        self._stale = True
+        for home in homes:
+            home.subscribe(self._on_event)
+    
+    def _on_event(self, event, device):
+        if event == "changed" and not self._stale:
+            row = self._positions.get(id(device))
+            if row is not None:
+                self._table[row] = device._energy_row()
+        elif event in ("added", "removed"):
+            self._stale = True
+    
+    def _rebuild(self):
+        devices = [d for home in self._homes for d in home.devices]
+        self._positions = {id(d): row for row, d in enumerate(devices)}
+        self._table = self._np.array([d._energy_row() for d in devices], dtype=float)
+        self._table.shape = (len(devices), len(self.ENERGY_COLUMNS))
+        self._stale = False
+    
+    def watts(self):
+        """Return the per-device power draw in watts, in home/device order."""
+        if self._stale:
+            self._rebuild()
+        np = self._np
+        is_on, on_watts, standby, variable, load, temperature, target, mode = self._table.T
+        delta = target - temperature
+        hvac_load = np.select([mode == 1.0, mode == 2.0, mode == 3.0],
+                              [np.maximum(delta, 0.0), np.maximum(-delta, 0.0), np.abs(delta)])
+        load = np.where(mode > 0.0, np.minimum(hvac_load / Thermostat.FULL_DUTY_DELTA, 1.0), load)
+        return np.where(is_on > 0.0, on_watts + variable * load, standby)
+    
+    def instant_watts(self):
+        """Return the total instantaneous power draw in watts."""
+        return float(self.watts().sum())
+    
+    def projected_kwh(self, hours):
+        """Return the energy used over ``hours`` if the current state is held."""
+        return self.instant_watts() * hours / 1000
+    
+    def close(self):
+        for home in self._homes:
+            home.unsubscribe(self._on_event)
+
+class ThermostatSimulator:
+    """Vectorized simulation of thermostat-controlled room temperatures.
+    
+    Every step moves each room toward its target at ``heat_rate`` or
+    ``cool_rate`` (°C per hour at full duty, with the same duty curve as the
+    power model) and drifts it toward ``ambient`` at ``drift_rate`` per hour.
+    Control state (power, mode, target) is read at construction and by
+    ``sync``; ``write_back`` records the simulated temperatures on the devices.
+    Requires the optional ``numpy`` package.
+    """
+    def __init__(self, thermostats, ambient=15.0, heat_rate=4.0, cool_rate=4.0, drift_rate=0.1):
+        self._np = _numpy()
+        self._devices = list(thermostats)
+        self.ambient = ambient
+        self.heat_rate = heat_rate
+        self.cool_rate = cool_rate
+        self.drift_rate = drift_rate
+        self._temperature = self._np.array([t.temperature for t in self._devices], dtype=float)
+        self.sync()
+    
+    @property
+    def temperatures(self): return self._temperature.copy()
+    
+    def sync(self):
+        """Reload power, mode and target temperature from the devices."""
+        np = self._np
+        self._target = np.array([t.target_temp for t in self._devices], dtype=float)
+        modes = np.array([_HVAC_MODE_CODES.get(t.mode, 0.0) if t.is_on else 0.0 for t in self._devices])
+        self._heats = (modes == 1.0) | (modes == 3.0)
+        self._cools = (modes == 2.0) | (modes == 3.0)
+    
+    def step(self, hours, steps=1):
+        """Advance the simulation by ``steps`` ticks of ``hours`` each."""
+        np = self._np
+        temperature = self._temperature
+        for _ in range(steps):
+            delta = self._target - temperature
+            duty = np.minimum(np.abs(delta) / Thermostat.FULL_DUTY_DELTA, 1.0)
+            heating = np.where(self._heats & (delta > 0.0), self.heat_rate * duty, 0.0)
+            cooling = np.where(self._cools & (delta < 0.0), self.cool_rate * duty, 0.0)
+            temperature += hours * (heating - cooling + self.drift_rate * (self.ambient - temperature))
+            np.clip(temperature, 5, 35, out=temperature)
+        return self.temperatures
+    
+    def write_back(self):
+        """Record the simulated temperatures on the thermostats."""
+        for thermostat, temperature in zip(self._devices, self._temperature.tolist()):
+            thermostat.record_temperature(round(temperature, 2))
@@ -0,0 +1,62 @@
+"""
+Smart Home System - Synthetic device and home generators for benchmarks and demos.
+"""
+import random
+from itertools import accumulate
+from .core import Camera, Light, MotionSensor, SmartHome, Thermostat
+
+# Synthetic fleet profile: device class -> (relative frequency, {room: relative frequency})
+GENERATOR_PROFILE = {
+    Light: (6, {"Living Room": 3, "Kitchen": 2, "Bedroom": 3, "Hallway": 2, "Bathroom": 1, "Office": 1}),
+    Thermostat: (1, {"Living Room": 2, "Hallway": 2, "Bedroom": 1, "Office": 1}),
+    Camera: (1, {"Front Door": 3, "Backyard": 2, "Garage": 1}),
+    MotionSensor: (2, {"Front Door": 1, "Backyard": 2, "Hallway": 2, "Garage": 1, "Living Room": 1}),
+}
+_GENERATOR_COLORS = ["White", "White", "Warm White", "Cool White", "Blue", "Red"]
+_GENERATOR_RESOLUTIONS = ["1080p", "1080p", "720p", "4K"]
+
+def generate_devices(count, seed=0, prefix=""):
+    """Lazily yield ``count`` devices drawn from GENERATOR_PROFILE.
+    
+    The sequence depends only on ``seed``; IDs are ``prefix`` plus a type
+    letter and a running number, so they are unique within one call.
+    """
+    rng = random.Random(seed)
+    classes = list(GENERATOR_PROFILE)
+    class_weights = list(accumulate(GENERATOR_PROFILE[cls][0] for cls in classes))
+    room_tables = {cls: (list(rooms), list(accumulate(rooms.values())))
+                   for cls, (_, rooms) in GENERATOR_PROFILE.items()}
+    choices, random_value, randint = rng.choices, rng.random, rng.randint
+    for n in range(count):
+        cls = choices(classes, cum_weights=class_weights)[0]
+        rooms, room_weights = room_tables[cls]
+        room = choices(rooms, cum_weights=room_weights)[0]
+        is_on = random_value() < 0.7
+        if cls is Light:
+            yield Light(f"{prefix}L{n}", f"{room} Light", is_on, True, room,
+                        randint(0, 100), choices(_GENERATOR_COLORS)[0])
+        elif cls is Thermostat:
+            mode = choices(Thermostat.VALID_MODES, cum_weights=[4, 6, 9, 10])[0]
+            yield Thermostat(f"{prefix}T{n}", f"{room} Thermostat", mode != "Off", True, room,
+                             round(rng.uniform(15, 28), 1), mode, float(randint(18, 24)))
+        elif cls is Camera:
+            armed = random_value() < 0.8
+            yield Camera(f"{prefix}C{n}", f"{room} Camera", True, random_value() < 0.95, room,
+                         "Armed" if armed else "Disarmed", randint(50, 100),
+                         choices(_GENERATOR_RESOLUTIONS)[0], armed)
+        else:
+            yield MotionSensor(f"{prefix}M{n}", f"{room} Sensor", True, random_value() < 0.95, room,
+                               "Armed" if random_value() < 0.8 else "Disarmed", randint(30, 90),
+                               randint(5, 15), None)
+
+def generate_home(device_count, seed=0, name="Generated Home"):
+    """Build a SmartHome holding ``device_count`` generated devices."""
+    home = SmartHome(name)
+    for device in generate_devices(device_count, seed):
+        home.add_device(device)
+    return home
+
+def generate_fleet(home_count, devices_per_home, seed=0):
+    """Lazily yield ``home_count`` generated homes, each from its own derived seed."""
+    for n in range(home_count):
+        yield generate_home(devices_per_home, seed * 1_000_003 + n, name=f"Home {n}")
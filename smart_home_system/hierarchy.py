@@ -0,0 +1,149 @@
+"""
+Smart Home System - Floor/zone/room hierarchy with incremental rollups.
+"""
+from .core import Device, SecurityDevice
+
+class RollupNode:
+    """A floor, zone or room of a RoomHierarchy with aggregate device counters."""
+    __slots__ = ("name", "parent", "children", "counts", "devices")
+    
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        # Totals in RoomHierarchy.COUNTERS order for every device below this node
+        self.counts = [0] * len(RoomHierarchy.COUNTERS)
+        # Rooms only: device class -> {device ID: device}
+        self.devices = {}
+    
+    def rollup(self):
+        return dict(zip(RoomHierarchy.COUNTERS, self.counts))
+
+class RoomHierarchy:
+    """Floor -> zone -> room tree over a home's devices with incremental rollups.
+    
+    ``layout`` maps a room name (a device ``location``) to ``(floor, zone)``;
+    rooms missing from it sit under floor None, zone None. Each device
+    contributes to the COUNTERS of its room and every ancestor; on a device
+    event only that path is updated, so rollups are O(1) to read and
+    subtree device queries touch only the rooms below the node.
+    """
+    COUNTERS = ("devices", "on", "connected", "armed")
+    
+    def __init__(self, home, layout=None):
+        self._home = home
+        self._root = RollupNode(home.name)
+        self._layout = dict(layout or {})
+        self._rooms = {}
+        # Device ID -> (room node, counter contribution)
+        self._entries = {}
+        for device in home.devices:
+            self._add(device)
+        home.subscribe(self._on_event)
+    
+    @staticmethod
+    def _contribution(device):
+        armed = isinstance(device, SecurityDevice) and device.armed_status == "Armed"
+        return (1, int(bool(device.is_on)), int(bool(device.connected)), int(armed))
+    
+    @staticmethod
+    def _apply(node, values, sign):
+        while node is not None:
+            counts = node.counts
+            for i, value in enumerate(values):
+                counts[i] += sign * value
+            node = node.parent
+    
+    def _child(self, parent, name):
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = RollupNode(name, parent)
+        return node
+    
+    def _room(self, room):
+        node = self._rooms.get(room)
+        if node is None:
+            floor, zone = self._layout.get(room, (None, None))
+            node = self._rooms[room] = self._child(self._child(self._child(self._root, floor), zone), room)
+        return node
+    
+    def _add(self, device):
+        node = self._room(device.location)
+        values = self._contribution(device)
+        node.devices.setdefault(type(device), {})[device.id] = device
+        self._entries[device.id] = (node, values)
+        self._apply(node, values, 1)
+    
+    def _remove(self, device):
+        node, values = self._entries.pop(device.id)
+        del node.devices[type(device)][device.id]
+        self._apply(node, values, -1)
+    
+    def _on_event(self, event, device):
+        if event == "added":
+            self._add(device)
+        elif event == "removed":
+            self._remove(device)
+        elif event == "changed":
+            node, old = self._entries[device.id]
+            new = self._contribution(device)
+            if new != old:
+                self._entries[device.id] = (node, new)
+                self._apply(node, [n - o for n, o in zip(new, old)], 1)
+    
+    def assign(self, room, floor, zone):
+        """Move ``room`` (and its totals) under ``floor``/``zone``."""
+        self._layout[room] = (floor, zone)
+        node = self._rooms.get(room)
+        if node is None:
+            return
+        self._apply(node.parent, node.counts, -1)
+        parent = node.parent
+        del parent.children[room]
+        # Drop zone and floor nodes left empty
+        while parent is not self._root and not parent.children:
+            del parent.parent.children[parent.name]
+            parent = parent.parent
+        node.parent = self._child(self._child(self._root, floor), zone)
+        node.parent.children[room] = node
+        self._apply(node.parent, node.counts, 1)
+    
+    def _node(self, floor, zone, room):
+        if room is not None:
+            return self._rooms.get(room)
+        if floor is None and zone is None:
+            return self._root
+        node = self._root.children.get(floor)
+        if node is not None and zone is not None:
+            node = node.children.get(zone)
+        return node
+    
+    def rollup(self, floor=None, zone=None, room=None):
+        """Return the counters of the whole home, a floor, a zone of a floor or a room."""
+        node = self._node(floor, zone, room)
+        return node.rollup() if node is not None else dict.fromkeys(self.COUNTERS, 0)
+    
+    def devices(self, device_class=Device, floor=None, zone=None, room=None):
+        """Return the devices of ``device_class`` (and subclasses) under the given node."""
+        node = self._node(floor, zone, room)
+        found = []
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            if node.devices:
+                for cls, group in node.devices.items():
+                    if issubclass(cls, device_class):
+                        found.extend(group.values())
+            stack.extend(node.children.values())
+        return found
+    
+    def dashboard(self):
+        """Return nested rollups: ``{floor: {"totals": ..., "zones": {zone: {"totals": ..., "rooms": {...}}}}}``."""
+        return {floor.name: {"totals": floor.rollup(),
+                             "zones": {zone.name: {"totals": zone.rollup(),
+                                                   "rooms": {room.name: room.rollup() for room in zone.children.values()}}
+                                       for zone in floor.children.values()}}
+                for floor in self._root.children.values()}
+    
+    def close(self):
+        self._home.unsubscribe(self._on_event)
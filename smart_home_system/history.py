@@ -0,0 +1,180 @@
+"""
+Smart Home System - Delta-encoded device state history.
+"""
+import time
+from array import array
+from bisect import bisect_right
+
+class HistoryBlock:
+    """A run of one device's history: a full base state followed by deltas.
+    
+    Each delta is a timestamp, a bitmask of the FIELDS that changed, and the
+    new values of those fields appended to ``values`` in field order. A mask
+    of 0 marks the device's removal from its home.
+    """
+    __slots__ = ("fields", "start", "base", "times", "masks", "values")
+    
+    def __init__(self, fields, start, base):
+        self.fields = fields
+        self.start = start
+        self.base = base
+        self.times = array("d")
+        self.masks = array("H")
+        self.values = []
+    
+    def state(self, count):
+        """Return the state tuple after the first ``count`` deltas, or None if removed by then."""
+        state = list(self.base)
+        position = 0
+        for mask in self.masks[:count]:
+            if not mask:
+                return None
+            field = 0
+            while mask:
+                if mask & 1:
+                    state[field] = self.values[position]
+                    position += 1
+                mask >>= 1
+                field += 1
+        return tuple(state)
+
+class DeviceHistory:
+    """Per-device audit history of state changes with time-travel queries.
+    
+    Subscribes to the given homes and appends every device change as a delta
+    against the device's previous state (see HistoryBlock). Deltas are
+    grouped in blocks of ``block_size`` that each start from a full state, so
+    ``state_at`` replays at most one block. Retention drops whole blocks
+    older than ``retention`` seconds, or beyond ``max_changes`` per device.
+    """
+    def __init__(self, *homes, retention=None, max_changes=None, block_size=64, clock=time.time):
+        self._homes = homes
+        self._retention = retention
+        self._max_changes = max_changes
+        self._block_size = block_size
+        self._clock = clock
+        # device ID -> [blocks, block start times, last state or None if removed, delta count]
+        self._tracks = {}
+        now = clock()
+        for home in homes:
+            for device in home.devices:
+                self.record(device, now)
+            home.subscribe(self._on_event)
+    
+    def _on_event(self, event, device):
+        if event == "removed":
+            self.record_removal(device)
+        elif event in ("added", "changed"):
+            self.record(device)
+    
+    def record(self, device, now=None):
+        """Append the current state of ``device`` at ``now`` (default: the clock) if it changed."""
+        now = self._clock() if now is None else now
+        state = device._get_state()
+        track = self._tracks.get(device.id)
+        if track is None:
+            track = self._tracks[device.id] = [[], [], None, 0]
+        blocks, starts, last, _ = track
+        block = blocks[-1] if blocks else None
+        if last is None or block.fields is not type(device).FIELDS:
+            block = HistoryBlock(type(device).FIELDS, now, state)
+            blocks.append(block)
+            starts.append(now)
+            track[2] = state
+            self._trim(track, now)
+            return
+        if state == last:
+            return
+        if len(block.masks) >= self._block_size:
+            # The next block starts from the state after this one's last delta
+            start = block.times[-1]
+            block = HistoryBlock(block.fields, start, last)
+            blocks.append(block)
+            starts.append(start)
+            self._trim(track, now)
+        mask = 0
+        for field, (old, new) in enumerate(zip(last, state)):
+            if old != new:
+                mask |= 1 << field
+                block.values.append(new)
+        block.times.append(max(now, block.times[-1] if block.times else block.start))
+        block.masks.append(mask)
+        track[2] = state
+        track[3] += 1
+    
+    def record_removal(self, device, now=None):
+        """Mark ``device`` as removed at ``now``; its history is kept until retention drops it."""
+        track = self._tracks.get(device.id)
+        if track is None or track[2] is None:
+            return
+        block = track[0][-1]
+        now = self._clock() if now is None else now
+        block.times.append(max(now, block.times[-1] if block.times else block.start))
+        block.masks.append(0)
+        track[2] = None
+        track[3] += 1
+    
+    def _trim(self, track, now):
+        blocks, starts = track[0], track[1]
+        cutoff = None if self._retention is None else now - self._retention
+        while len(blocks) > 1 and ((cutoff is not None and starts[1] <= cutoff) or
+                                   (self._max_changes is not None and
+                                    track[3] - len(blocks[0].masks) >= self._max_changes)):
+            track[3] -= len(blocks[0].masks)
+            del blocks[0], starts[0]
+    
+    def trim(self, now=None):
+        """Apply retention to every device; drops removed devices whose history has expired."""
+        now = self._clock() if now is None else now
+        for device_id, track in list(self._tracks.items()):
+            self._trim(track, now)
+            block = track[0][-1]
+            if (track[2] is None and self._retention is not None
+                    and block.times[-1] <= now - self._retention):
+                del self._tracks[device_id]
+    
+    def state_at(self, device_id, when):
+        """Return ``{field: value}`` for ``device_id`` at time ``when``.
+        
+        Returns None if the device did not exist then or that part of its
+        history was dropped by retention.
+        """
+        track = self._tracks.get(device_id)
+        if track is None:
+            return None
+        index = bisect_right(track[1], when) - 1
+        if index < 0:
+            return None
+        block = track[0][index]
+        state = block.state(bisect_right(block.times, when))
+        return None if state is None else dict(zip(block.fields, state))
+    
+    def changes(self, device_id, since=None, until=None):
+        """Return ``[(time, {field: new value})]`` for ``device_id``; a removal is ``(time, None)``."""
+        track = self._tracks.get(device_id)
+        found = []
+        for block in (track[0] if track is not None else ()):
+            position = 0
+            for when, mask in zip(block.times, block.masks):
+                delta = None if not mask else {}
+                field = 0
+                while mask:
+                    if mask & 1:
+                        delta[block.fields[field]] = block.values[position]
+                        position += 1
+                    mask >>= 1
+                    field += 1
+                if (since is None or when >= since) and (until is None or when <= until):
+                    found.append((when, delta))
+        return found
+    
+    def change_count(self, device_id=None):
+        """Return the number of retained deltas for ``device_id``, or for all devices."""
+        if device_id is not None:
+            track = self._tracks.get(device_id)
+            return 0 if track is None else track[3]
+        return sum(track[3] for track in self._tracks.values())
+    
+    def close(self):
+        for home in self._homes:
+            home.unsubscribe(self._on_event)
@@ -0,0 +1,86 @@
+"""
+Smart Home System - Heartbeat monitoring of device connectivity.
+"""
+import time
+
+class HeartbeatMonitor:
+    """Marks devices disconnected when they miss heartbeats, using a timing wheel.
+    
+    Every device of the attached home gets a deadline ``timeout`` seconds after
+    its last heartbeat, filed in the wheel slot for that time (slots are
+    ``resolution`` seconds wide). ``tick`` empties only the slots that have
+    fully passed, so its cost is proportional to the devices that expire, not
+    to the size of the home. Expired devices are disconnected in one scoped
+    transaction; a heartbeat from a disconnected device reconnects it.
+    """
+    def __init__(self, home, timeout=30.0, resolution=1.0, clock=time.monotonic):
+        self._home = home
+        self._timeout = timeout
+        self._resolution = resolution
+        self._clock = clock
+        self._wheel = [set() for _ in range(int(timeout / resolution) + 2)]
+        self._deadlines = {}
+        # IDs expired by a catch-up tick inside heartbeat, reported by the next tick
+        self._overdue = []
+        now = clock()
+        # Last wheel bucket that has been fully processed
+        self._processed = self._bucket(now) - 1
+        for device in home.devices:
+            self._schedule(device.id, now)
+        home.subscribe(self._on_event)
+    
+    def _bucket(self, when):
+        return int(when // self._resolution)
+    
+    def _schedule(self, device_id, now):
+        if self._bucket(now + self._timeout) - self._processed > len(self._wheel):
+            # Catch up first so the new deadline cannot share a slot with an unprocessed one
+            self._overdue.extend(self.tick(now))
+        deadline = self._deadlines.get(device_id)
+        if deadline is not None:
+            self._wheel[self._bucket(deadline) % len(self._wheel)].discard(device_id)
+        deadline = self._deadlines[device_id] = now + self._timeout
+        self._wheel[self._bucket(deadline) % len(self._wheel)].add(device_id)
+    
+    def _on_event(self, event, device):
+        if event == "added":
+            self._schedule(device.id, self._clock())
+        elif event == "removed":
+            deadline = self._deadlines.pop(device.id, None)
+            if deadline is not None:
+                self._wheel[self._bucket(deadline) % len(self._wheel)].discard(device.id)
+    
+    def heartbeat(self, device_id, now=None):
+        """Record a heartbeat from ``device_id``, reconnecting it if it had been marked down."""
+        device = self._home.find_device(device_id)
+        self._schedule(device_id, self._clock() if now is None else now)
+        if not device.connected:
+            device.connect()
+        return True
+    
+    def tick(self, now=None):
+        """Disconnect devices whose deadline slot has passed; returns their IDs."""
+        current = self._bucket(self._clock() if now is None else now)
+        first = max(self._processed + 1, current - len(self._wheel))
+        expired, self._overdue = self._overdue, []
+        overdue = len(expired)
+        wheel = self._wheel
+        for bucket in range(first, current):
+            slot = bucket % len(wheel)
+            if wheel[slot]:
+                expired.extend(wheel[slot])
+                # A fresh set, since one emptied by discards keeps its large table
+                wheel[slot] = set()
+        self._processed = max(self._processed, current - 1)
+        for device_id in expired[overdue:]:
+            del self._deadlines[device_id]
+        devices = [self._home.find_device(device_id) for device_id in expired[overdue:]]
+        devices = [device for device in devices if device.connected]
+        if devices:
+            with self._home.transaction(devices):
+                for device in devices:
+                    device.disconnect()
+        return expired
+    
+    def close(self):
+        self._home.unsubscribe(self._on_event)
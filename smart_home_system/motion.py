@@ -0,0 +1,118 @@
+"""
+Smart Home System - Sliding-window motion trigger analytics.
+"""
+import time
+from .core import MotionSensor
+
+class WindowCounter:
+    """Event count over a sliding time window, kept in a fixed ring of buckets.
+    
+    The window is split into ``buckets`` equal slots; events older than the
+    window fall out a whole slot at a time. Memory is constant and both
+    ``add`` and ``count`` are O(1) amortized.
+    """
+    __slots__ = ("_width", "_counts", "_total", "_current")
+    
+    def __init__(self, window, buckets=60):
+        self._width = window / buckets
+        self._counts = [0] * buckets
+        self._total = 0
+        self._current = None
+    
+    def _advance(self, now):
+        bucket = int(now // self._width)
+        current = self._current
+        if current is None or bucket - current >= len(self._counts):
+            if self._total:
+                self._counts = [0] * len(self._counts)
+                self._total = 0
+            self._current = bucket
+        elif bucket > current:
+            size = len(self._counts)
+            for stale in range(current + 1, bucket + 1):
+                slot = stale % size
+                self._total -= self._counts[slot]
+                self._counts[slot] = 0
+            self._current = bucket
+        return bucket
+    
+    def add(self, now, count=1):
+        bucket = self._advance(now)
+        # Late events that already left the window are dropped
+        if bucket > self._current - len(self._counts):
+            self._counts[bucket % len(self._counts)] += count
+            self._total += count
+    
+    def count(self, now):
+        self._advance(now)
+        return self._total
+
+class MotionAnalytics:
+    """Sliding-window motion trigger counts per sensor and per room.
+    
+    Subscribes to the given homes and counts each MotionSensor trigger (via
+    its ``trigger_count``) into one WindowCounter per window for the sensor
+    and for its room. ``windows`` maps a name to a length in seconds; rooms
+    with the same name in different homes share counters.
+    """
+    WINDOWS = {"minute": 60, "hour": 3600}
+    
+    def __init__(self, *homes, windows=None, buckets=60, clock=time.time):
+        self._homes = homes
+        self._windows = dict(self.WINDOWS if windows is None else windows)
+        self._buckets = buckets
+        self._clock = clock
+        self._seen = {}
+        self._sensors = {}
+        self._rooms = {}
+        for home in homes:
+            for sensor in home.get_devices_by_type(MotionSensor):
+                self._seen[sensor.id] = sensor.trigger_count
+            home.subscribe(self._on_event)
+    
+    def _counters(self, table, key):
+        counters = table.get(key)
+        if counters is None:
+            counters = table[key] = {name: WindowCounter(length, self._buckets)
+                                     for name, length in self._windows.items()}
+        return counters
+    
+    def _on_event(self, event, device):
+        if not isinstance(device, MotionSensor):
+            return
+        if event == "removed":
+            self._seen.pop(device.id, None)
+            self._sensors.pop(device.id, None)
+            return
+        triggers = device.trigger_count - self._seen.get(device.id, device.trigger_count if event == "added" else 0)
+        self._seen[device.id] = device.trigger_count
+        if triggers > 0:
+            self.record(device, triggers)
+    
+    def record(self, sensor, count=1, now=None):
+        """Count ``count`` triggers of ``sensor`` at ``now`` (default: the clock)."""
+        now = self._clock() if now is None else now
+        for counter in self._counters(self._sensors, sensor.id).values():
+            counter.add(now, count)
+        for counter in self._counters(self._rooms, sensor.location).values():
+            counter.add(now, count)
+    
+    def sensor_count(self, sensor_id, window="minute", now=None):
+        """Return the triggers of ``sensor_id`` within the named window."""
+        counters = self._sensors.get(sensor_id)
+        return 0 if counters is None else counters[window].count(self._clock() if now is None else now)
+    
+    def room_count(self, room, window="minute", now=None):
+        """Return the triggers of all sensors in ``room`` within the named window."""
+        counters = self._rooms.get(room)
+        return 0 if counters is None else counters[window].count(self._clock() if now is None else now)
+    
+    def alerts(self, threshold, window="minute", now=None):
+        """Return ``{sensor_id: count}`` for sensors with at least ``threshold`` triggers in the window."""
+        now = self._clock() if now is None else now
+        counts = ((sensor_id, counters[window].count(now)) for sensor_id, counters in self._sensors.items())
+        return {sensor_id: count for sensor_id, count in counts if count >= threshold}
+    
+    def close(self):
+        for home in self._homes:
+            home.unsubscribe(self._on_event)
@@ -0,0 +1,197 @@
+"""
+Smart Home System - Append-only event log persistence for SmartHome.
+"""
+import json
+import os
+from .core import SmartHome, _decode_symbols, _intern
+
+class EventLog:
+    """Append-only JSON Lines log of SmartHome events with snapshot compaction.
+    
+    Every published home event becomes one record: "put" with the device's
+    full state, "remove" with its id, or "mode". Records are buffered and
+    written every ``batch_size`` events (optionally fsync'd). After
+    ``compact_every`` records the home is dumped to ``snapshot_path`` and the
+    log is truncated, so replay reads one snapshot plus a short tail.
+    
+    Each compaction starts a new generation: the snapshot header and the
+    first ("begin") record of the log carry it, and replay ignores a log
+    older than the snapshot, as left by a crash between the two steps.
+    """
+    def __init__(self, path, snapshot_path=None, batch_size=256, fsync=False, compact_every=None):
+        self._path = path
+        self._snapshot_path = snapshot_path or path + ".snapshot"
+        self._batch_size = batch_size
+        self._fsync = fsync
+        self._compact_every = compact_every
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._buffer = []
+        self._since_compaction = 0
+        self._file = None
+        self._home = None
+        self._generation = 0
+    
+    def attach(self, home):
+        """Start logging ``home``; writes an initial snapshot if nothing is on disk yet."""
+        self._home = home
+        fresh = not os.path.exists(self._path) and not os.path.exists(self._snapshot_path)
+        self._generation = self._snapshot_generation(self._snapshot_path)
+        stale = self._log_generation(self._path) not in (None, self._generation)
+        if not stale and os.path.exists(self._path):
+            self._repair_tail(self._path)
+        self._file = open(self._path, "w" if stale else "a", encoding="utf-8")
+        if self._file.tell() == 0:
+            self._begin()
+        home.subscribe(self._record)
+        if fresh:
+            self.compact()
+        return self
+    
+    def _begin(self):
+        self._file.write(self._encode({"op": "begin", "generation": self._generation}) + "\n")
+        self.flush()
+    
+    @staticmethod
+    def _repair_tail(path):
+        """End the log on a complete line before appending to it.
+        
+        A final record torn by a crash is cut off; otherwise the next append
+        would be glued onto it and replay would stop at the merged line. A
+        complete record that only lacks its newline is kept.
+        """
+        with open(path, "rb+") as log:
+            end = log.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            log.seek(end - 1)
+            if log.read(1) == b"\n":
+                return
+            cut = 0
+            while end > 0:
+                start = max(0, end - 4096)
+                log.seek(start)
+                newline = log.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    cut = start + newline + 1
+                    break
+                end = start
+            log.seek(cut)
+            try:
+                json.loads(log.read())
+            except ValueError:
+                log.truncate(cut)
+            else:
+                log.write(b"\n")
+    
+    @staticmethod
+    def _snapshot_generation(snapshot_path):
+        if not os.path.exists(snapshot_path):
+            return 0
+        with open(snapshot_path, encoding="utf-8") as snapshot:
+            return json.loads(snapshot.readline()).get("generation", 0)
+    
+    @staticmethod
+    def _log_generation(path):
+        """Return the generation in the log's begin record, or None for a missing, empty or unversioned log."""
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as log:
+            try:
+                record = json.loads(log.readline())
+            except ValueError:
+                return None
+        return record.get("generation") if record.get("op") == "begin" else None
+    
+    def _record(self, event, subject):
+        if event == "mode":
+            record = {"op": "mode", "mode": subject}
+        elif event == "removed":
+            record = {"op": "remove", "id": subject.id}
+        else:
+            record = {"op": "put", "device": subject.to_dict()}
+        self._buffer.append(self._encode(record))
+        self._since_compaction += 1
+        if self._compact_every and self._since_compaction >= self._compact_every:
+            self.compact()
+        elif len(self._buffer) >= self._batch_size:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered records to disk."""
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+    
+    def compact(self):
+        """Snapshot the attached home as a new generation and restart the log."""
+        generation = self._generation + 1
+        tmp_path = self._snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as snapshot:
+            self._home.dump(snapshot, meta={"generation": generation})
+            snapshot.flush()
+            if self._fsync:
+                os.fsync(snapshot.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+        # From here the old log is outdated by the snapshot, even if truncating it fails
+        self._generation = generation
+        self._buffer = []
+        self._file.close()
+        self._file = open(self._path, "w", encoding="utf-8")
+        self._begin()
+        self._since_compaction = 0
+    
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._home.unsubscribe(self._record)
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @staticmethod
+    def replay(path, snapshot_path=None, name="Smart Home"):
+        """Rebuild a SmartHome from a snapshot plus the log written after it.
+        
+        Records are folded into one latest state per device before any device
+        is constructed. A torn final line from an interrupted write is ignored,
+        and so is a log from an older generation than the snapshot.
+        """
+        snapshot_path = snapshot_path or path + ".snapshot"
+        mode = "Home"
+        states = {}
+        generation = 0
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as snapshot:
+                header = json.loads(snapshot.readline())
+                name, mode = header["name"], header.get("mode", mode)
+                generation = header.get("generation", 0)
+                symbols = [_intern(symbol) for symbol in header.get("symbols", ())]
+                for line in snapshot:
+                    record = json.loads(line)
+                    if symbols:
+                        _decode_symbols(record, symbols)
+                    states[record["id"]] = record
+        if os.path.exists(path) and EventLog._log_generation(path) in (None, generation):
+            with open(path, encoding="utf-8") as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    op = record["op"]
+                    if op == "put":
+                        device = record["device"]
+                        states[device["id"]] = device
+                    elif op == "remove":
+                        states.pop(record["id"], None)
+                    elif op == "mode":
+                        mode = record["mode"]
+        return SmartHome.from_dict({"name": name, "mode": mode, "devices": list(states.values())})
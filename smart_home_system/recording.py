@@ -0,0 +1,192 @@
+"""
+Smart Home System - Memory-mapped ring store for camera recording segments.
+"""
+import mmap
+import struct
+import time
+from collections import deque
+from .core import Camera, InvalidInputException
+
+class RecordingSegment:
+    """One camera recording: start/stop times and its byte range in a RecordingStore.
+    
+    ``offset`` and ``end`` are logical positions in the ring (they only grow);
+    frames of other cameras may be interleaved inside the range. ``last`` is
+    the position of the newest frame, or -1 before the first one.
+    """
+    __slots__ = ("camera_id", "start", "stop", "offset", "end", "last", "frames", "nbytes")
+    
+    def __init__(self, camera_id, start, offset):
+        self.camera_id = camera_id
+        self.start = start
+        self.stop = None
+        self.offset = offset
+        self.end = offset
+        self.last = -1
+        self.frames = 0
+        self.nbytes = 0
+
+class RecordingStore:
+    """Memory-mapped ring file of camera frames with a per-camera segment index.
+    
+    Frames are written in place into a fixed ``capacity``-byte file as a
+    24-byte header (camera number, payload length, timestamp, position of the
+    camera's previous frame) plus payload;
+    when the ring is full the oldest frames are overwritten and closed
+    segments that lie wholly before the oldest retained frame are dropped
+    from the index. Segments open and close with each camera's ``recording``
+    flag when the store is attached to a home, or explicitly via
+    ``start_segment``/``stop_segment``. The index itself is kept in memory.
+    """
+    FRAME = struct.Struct("<IIdq")
+    # Camera number marking the unused space skipped at the end of the ring
+    PADDING = 0xFFFFFFFF
+    
+    def __init__(self, path, capacity=64 * 1024 * 1024):
+        if capacity < 2 * self.FRAME.size:
+            raise InvalidInputException("Recording store capacity is too small")
+        self._capacity = capacity
+        self._file = open(path, "w+b")
+        self._file.truncate(capacity)
+        self._map = mmap.mmap(self._file.fileno(), capacity)
+        # Logical positions of the oldest retained frame and the next write
+        self._tail = 0
+        self._head = 0
+        self._camera_numbers = {}
+        self._segments = {}
+        self._open = {}
+        # Closed segments in closing order, which is also the order of their ends
+        self._closed = deque()
+        self._home = None
+    
+    @property
+    def capacity(self): return self._capacity
+    
+    def attach(self, home):
+        """Keep segments in step with the recording state of ``home``'s cameras."""
+        self._home = home
+        for device in home.get_devices_by_type(Camera):
+            self._sync(device)
+        home.subscribe(self._on_event)
+        return self
+    
+    def _on_event(self, event, subject):
+        if isinstance(subject, Camera):
+            if event == "removed":
+                self.stop_segment(subject.id)
+            else:
+                self._sync(subject)
+    
+    def _sync(self, camera):
+        if camera.recording and camera.id not in self._open:
+            self.start_segment(camera.id)
+        elif not camera.recording and camera.id in self._open:
+            self.stop_segment(camera.id)
+    
+    def start_segment(self, camera_id, timestamp=None):
+        """Open a new segment for ``camera_id`` (closing any open one) and return it."""
+        self.stop_segment(camera_id, timestamp)
+        if camera_id not in self._camera_numbers:
+            self._camera_numbers[camera_id] = len(self._camera_numbers)
+            self._segments[camera_id] = deque()
+        segment = RecordingSegment(camera_id, time.time() if timestamp is None else timestamp, self._head)
+        self._segments[camera_id].append(segment)
+        self._open[camera_id] = segment
+        return segment
+    
+    def stop_segment(self, camera_id, timestamp=None):
+        """Close the open segment of ``camera_id``; returns it, or None if there was none."""
+        segment = self._open.pop(camera_id, None)
+        if segment is not None:
+            segment.stop = time.time() if timestamp is None else timestamp
+            self._closed.append(segment)
+        return segment
+    
+    def append(self, camera_id, payload, timestamp=None):
+        """Write one frame to the open segment of ``camera_id``.
+        
+        ``payload`` is any bytes-like object. Returns False if the camera has
+        no open segment.
+        """
+        segment = self._open.get(camera_id)
+        if segment is None:
+            return False
+        size = self.FRAME.size + len(payload)
+        if size > self._capacity:
+            raise InvalidInputException(f"Frame of {len(payload)} bytes exceeds the recording store capacity")
+        position = self._head % self._capacity
+        if position + size > self._capacity:
+            # Frames never wrap: skip the rest of the ring
+            self._reserve(self._head + self._capacity - position)
+            if self._capacity - position >= self.FRAME.size:
+                self.FRAME.pack_into(self._map, position, self.PADDING, 0, 0.0, -1)
+            self._head += self._capacity - position
+            position = 0
+        self._reserve(self._head + size)
+        self.FRAME.pack_into(self._map, position, self._camera_numbers[camera_id], len(payload),
+                             time.time() if timestamp is None else timestamp, segment.last)
+        self._map[position + self.FRAME.size:position + size] = payload
+        segment.last = self._head
+        self._head += size
+        segment.end = self._head
+        segment.frames += 1
+        segment.nbytes += len(payload)
+        return True
+    
+    def _reserve(self, head):
+        # Advance the tail past the frames that writing up to ``head`` overwrites
+        if head - self._tail <= self._capacity:
+            return
+        while head - self._tail > self._capacity:
+            self._tail = self._next_frame(self._tail)
+        closed = self._closed
+        while closed and closed[0].end <= self._tail:
+            segment = closed.popleft()
+            self._segments[segment.camera_id].popleft()
+    
+    def _next_frame(self, offset):
+        position = offset % self._capacity
+        remaining = self._capacity - position
+        if remaining < self.FRAME.size:
+            return offset + remaining
+        number, length, _, _ = self.FRAME.unpack_from(self._map, position)
+        if number == self.PADDING:
+            return offset + remaining
+        return offset + self.FRAME.size + length
+    
+    def segments(self, camera_id):
+        """Return the retained segments of ``camera_id``, oldest first."""
+        return list(self._segments.get(camera_id, ()))
+    
+    def read(self, segment):
+        """Return ``[(timestamp, payload), ...]`` for the retained frames of ``segment``, oldest first.
+        
+        Follows the per-camera frame chain backwards, so the cost depends on the
+        segment's own frames rather than on other cameras' traffic.
+        """
+        floor = max(segment.offset, self._tail)
+        frames = []
+        offset = segment.last
+        while offset >= floor:
+            position = offset % self._capacity
+            _, length, timestamp, previous = self.FRAME.unpack_from(self._map, position)
+            start = position + self.FRAME.size
+            frames.append((timestamp, self._map[start:start + length]))
+            offset = previous
+        frames.reverse()
+        return frames
+    
+    def close(self):
+        if self._map is not None:
+            if self._home is not None:
+                self._home.unsubscribe(self._on_event)
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+            self._map = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
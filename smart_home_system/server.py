@@ -0,0 +1,185 @@
+"""
+Smart Home System - Local HTTP/JSON control server built on asyncio.
+"""
+import asyncio
+import io
+import json
+from urllib.parse import parse_qs, unquote, urlsplit
+from .core import DEVICE_TYPES, Device, DeviceNotFoundException, InvalidInputException
+from .batch import run_batch
+
+class HomeServer:
+    """Local HTTP/JSON control server for a SmartHome, built on asyncio.
+    
+    Connections are kept alive (HTTP/1.1) unless the client sends
+    ``Connection: close``. Routes:
+    
+        GET    /home                        name, mode, device count, room counts
+        GET    /devices[?room=R&type=T]     device dicts
+        GET    /devices/<id>                one device dict
+        POST   /devices                     add a device from its dict
+        DELETE /devices/<id>                remove a device
+        POST   /devices/<id>/<command>      run a device command, body {"args": [...]}
+        POST   /automation                  body {"name": ...}
+        POST   /mode                        body {"mode": ...}
+        POST   /batch                       body {"commands": [...]} in run_batch syntax
+    """
+    REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+    
+    def __init__(self, home, host="127.0.0.1", port=8080):
+        self.home = home
+        self.host = host
+        self.port = port
+        self._server = None
+    
+    async def start(self):
+        """Start listening; with ``port=0`` the chosen port is stored in ``self.port``."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+    
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+    
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    # Without a well-formed request line the rest of the stream cannot be trusted
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Invalid Content-Length"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = self.handle(method, target, body)
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {self.REASONS.get(status, '')}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                     .encode("latin-1") + data)
+        await writer.drain()
+    
+    def handle(self, method, target, body=b""):
+        """Dispatch one request and return ``(status, payload)``."""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        routes = self._routes(parts)
+        if routes is None:
+            return 404, {"error": f"No route for {method} {url.path}"}
+        route = routes.get(method)
+        if route is None:
+            return 405, {"error": f"Method {method} not allowed for {url.path}", "allow": sorted(routes)}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise InvalidInputException("Request body must be a JSON object")
+            return route(parts, data, parse_qs(url.query))
+        except DeviceNotFoundException as e:
+            return 404, {"error": str(e)}
+        except (InvalidInputException, ValueError, TypeError, KeyError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+    
+    def _routes(self, parts):
+        """Return the ``{method: handler}`` table for a path, or None if no route has that path."""
+        if parts == ["home"]:
+            return {"GET": self._get_home}
+        if parts[:1] == ["devices"]:
+            if len(parts) == 1:
+                return {"GET": self._list_devices, "POST": self._add_device}
+            if len(parts) == 2:
+                return {"GET": self._get_device, "DELETE": self._remove_device}
+            if len(parts) == 3:
+                return {"POST": self._control_device}
+        if len(parts) == 1 and parts[0] in ("automation", "mode", "batch"):
+            return {"POST": {"automation": self._automation, "mode": self._mode, "batch": self._batch}[parts[0]]}
+        return None
+    
+    def _get_home(self, parts, data, query):
+        snapshot = self.home.snapshot()
+        return 200, {"name": snapshot.name, "mode": snapshot.mode, "devices": len(snapshot.devices),
+                     "rooms": {room: len(snapshot.get_devices_by_room(room)) for room in sorted(snapshot.rooms)}}
+    
+    def _list_devices(self, parts, data, query):
+        snapshot = self.home.snapshot()
+        devices = snapshot.get_devices_by_room(query["room"][0]) if "room" in query else snapshot.devices
+        if "type" in query:
+            device_class = DEVICE_TYPES.get(query["type"][0])
+            if device_class is None:
+                raise InvalidInputException(f"Unknown device type: {query['type'][0]}")
+            devices = [d for d in devices if isinstance(d, device_class)]
+        return 200, [d.to_dict() for d in devices]
+    
+    def _get_device(self, parts, data, query):
+        return 200, self.home.find_device(parts[1]).to_dict()
+    
+    def _add_device(self, parts, data, query):
+        device = Device.from_dict(data)
+        if not self.home.add_device(device):
+            return 409, {"error": f"Device with ID {device.id} already exists"}
+        return 201, device.to_dict()
+    
+    def _remove_device(self, parts, data, query):
+        if not self.home.remove_device(parts[1]):
+            raise DeviceNotFoundException(f"Device with ID {parts[1]} not found")
+        return 200, {"removed": parts[1]}
+    
+    def _control_device(self, parts, data, query):
+        args = data.get("args", [])
+        if not isinstance(args, list):
+            raise InvalidInputException("args must be a JSON array")
+        result = self.home.control(parts[1], parts[2], *args)
+        return 200, {"result": result, "device": self.home.find_device(parts[1]).to_dict()}
+    
+    def _automation(self, parts, data, query):
+        applied, skipped = self.home.run_automation(data["name"])
+        return 200, {"automation": data["name"], "applied": applied, "skipped": skipped}
+    
+    def _mode(self, parts, data, query):
+        return 200, {"mode": self.home.change_mode(data["mode"])}
+    
+    def _batch(self, parts, data, query):
+        commands = data["commands"]
+        if not isinstance(commands, list) or not all(isinstance(command, str) for command in commands):
+            raise InvalidInputException("commands must be a JSON array of strings")
+        out = io.StringIO()
+        executed, failed = run_batch(self.home, commands, out)
+        return 200, {"executed": executed, "failed": failed, "output": out.getvalue().splitlines()}
@@ -0,0 +1,14 @@
+import pytest
+from smart_home_system import Device, isolated_registry
+
+
+@pytest.fixture(autouse=True)
+def isolated_device_state():
+    """Give every test its own device count and device type registry.
+
+    Together with per-process test sharding this lets the functional,
+    boundary and exceptional suites run in parallel worker processes.
+    """
+    Device.reset_device_count()
+    with isolated_registry():
+        yield
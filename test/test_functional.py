@@ -1,6 +1,18 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 import pytest
 from test.TestUtils import TestUtils
-from smart_home_system import Device, Light, Thermostat, SecurityDevice, Camera, MotionSensor, SmartHome
+from test.ResultSink import FileSink, HttpSink, MemorySink, sink_from_environment
+from smart_home_system import Device, Light, Thermostat, SecurityDevice, Camera, MotionSensor, SmartHome, EventLog, EnergyEstimator
+from smart_home_system import ThermostatSimulator, generate_devices, generate_home, generate_fleet
+from smart_home_system import run_batch, HomeServer, register_device_type, device_type, RecordingStore, MotionAnalytics, HeartbeatMonitor, RoomHierarchy, DeviceHistory
+from smart_home_system import InvalidInputException, isolated_registry, MODE_AUTOMATIONS
 
 class TestFunctional:
     """Test cases for functional requirements of the smart home system."""
@@ -126,6 +138,20 @@ class TestFunctional:
             assert camera.armed_status == "Disarmed"
             assert camera.recording == False  # Stop recording when disarmed
             
+            # Overrides notify observers once, after all of their changes
+            seen = []
+            camera.add_observer(lambda device: seen.append((device.is_on, device.armed_status, device.recording)))
+            camera.arm()
+            camera.disarm()
+            camera.arm()
+            camera.toggle_power()
+            assert seen == [(True, "Armed", True), (True, "Disarmed", False),
+                            (True, "Armed", True), (False, "Disarmed", True)]
+            thermostat = Thermostat("T001", "Living Room Thermostat", True, True, "Living Room", 22.5, "Heat", 23.0)
+            thermostat.add_observer(lambda device: seen.append((device.is_on, device.mode)))
+            thermostat.toggle_power()
+            assert seen[4:] == [(False, "Off")]
+            
             # Test MotionSensor subclass
             motion = MotionSensor("M001", "Backyard Sensor", True, True, "Backyard", "Armed", 60, 10, None)
             assert isinstance(motion, SecurityDevice)
@@ -200,6 +226,74 @@ class TestFunctional:
             TestUtils.yakshaAssert("test_polymorphism", False, "functional")
             raise e
     
+    def test_display_info_cache(self):
+        """Test cached device rendering and bulk rendering of all devices."""
+        try:
+            light = Light("L001", "Living Room Light", True, True, "Living Room", 80, "White")
+            camera = Camera("C001", "Front Door Camera", True, True, "Front Door", "Disarmed", 80, "1080p", False)
+            
+            # Repeated calls reuse the cached rendering
+            first = light.display_info()
+            assert light.display_info() is first
+            
+            # State changes invalidate the cache
+            light.dim(40)
+            assert "Brightness: 40%" in light.display_info()
+            camera.start_recording()
+            assert "| Recording" in camera.display_info()
+            camera.toggle_power()
+            assert "Disarmed" in camera.display_info()
+            
+            # Bulk rendering streams every device into one buffer
+            home = SmartHome("My Smart Home")
+            home.add_device(light)
+            home.add_device(camera)
+            rendered = home.render_devices()
+            assert rendered == light.display_info() + "\n" + camera.display_info()
+            
+            buffer = io.StringIO()
+            assert home.render_devices(buffer) == 2
+            assert buffer.getvalue() == rendered + "\n"
+            
+            TestUtils.yakshaAssert("test_display_info_cache", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_display_info_cache", False, "functional")
+            raise e
+    
+    def test_serialization(self):
+        """Test dict round trips and streaming JSON Lines encoding of a home."""
+        try:
+            thermostat = Thermostat("T001", "Main Thermostat", True, True, "Hallway", 22.5, "Heat", 23.0)
+            data = thermostat.to_dict()
+            assert data["type"] == "Thermostat"
+            assert data["target_temp"] == 23.0
+            
+            restored = Device.from_dict(data)
+            assert isinstance(restored, Thermostat)
+            assert restored.display_info() == thermostat.display_info()
+            
+            home = SmartHome("My Smart Home")
+            home.add_device(Light("L001", "Kitchen Light", False, True, "Kitchen", 70, "White"))
+            home.add_device(Camera("C001", "Front Door Camera", True, True, "Front Door", "Armed", 80, "1080p", True))
+            home.add_device(MotionSensor("M001", "Backyard Sensor", True, True, "Backyard", "Armed", 60, 10, None))
+            home.change_mode("Vacation")
+            
+            buffer = io.StringIO()
+            assert home.dump(buffer) == 3
+            assert len(buffer.getvalue().splitlines()) == 4
+            
+            buffer.seek(0)
+            loaded = SmartHome.load(buffer)
+            assert loaded.name == "My Smart Home"
+            assert loaded.mode == "Vacation"
+            assert loaded.rooms == home.rooms
+            assert loaded.render_devices() == home.render_devices()
+            
+            TestUtils.yakshaAssert("test_serialization", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_serialization", False, "functional")
+            raise e
+    
     def test_smart_home_device_management(self):
         """Test SmartHome device management capabilities."""
         try:
@@ -318,6 +412,996 @@ class TestFunctional:
             TestUtils.yakshaAssert("test_smart_home_automations", False, "functional")
             raise e
     
+    def test_transactions(self):
+        """Test transactional automations with rollback and batched events."""
+        try:
+            home = SmartHome("My Smart Home")
+            light = Light("L001", "Kitchen Light", True, True, "Kitchen", 80, "White")
+            thermostat = Thermostat("T001", "Main Thermostat", True, True, "Hallway", 22.5, "Heat", 23.0)
+            home.add_device(light)
+            home.add_device(thermostat)
+            
+            events = []
+            home.subscribe(lambda event, subject: events.append((event, subject)))
+            
+            # A failing block leaves devices, membership and mode untouched
+            try:
+                with home.transaction():
+                    light.dim(10)
+                    light.change_color("Blue")
+                    home.add_device(Light("L002", "Bedroom Light", True, True, "Bedroom", 50, "White"))
+                    thermostat.set_temperature(50)
+                assert False, "Should raise InvalidInputException"
+            except InvalidInputException:
+                pass  # Expected behavior
+            assert light.brightness == 80
+            assert light.color == "White"
+            assert "Brightness: 80%" in light.display_info()
+            assert len(home.devices) == 2
+            assert home.rooms == {"Kitchen", "Hallway"}
+            assert events == []
+            
+            # A successful block publishes each changed device once
+            with home.transaction():
+                light.dim(10)
+                light.change_color("Blue")
+                thermostat.set_temperature(20)
+            assert events == [("changed", light), ("changed", thermostat)]
+            
+            del events[:]
+            home.change_mode("Night")
+            assert events[0] == ("mode", "Night")
+            assert len([e for e in events if e[0] == "changed"]) == 2
+            
+            TestUtils.yakshaAssert("test_transactions", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_transactions", False, "functional")
+            raise e
+    
+    def test_event_log_replay(self, tmp_path):
+        """Test that logged state changes and mode changes replay into an equal home."""
+        try:
+            path = str(tmp_path / "home.log")
+            home = SmartHome("My Smart Home")
+            light = Light("L001", "Kitchen Light", False, True, "Kitchen", 80, "White")
+            home.add_device(light)
+            
+            log = EventLog(path, batch_size=2).attach(home)
+            home.add_device(Camera("C001", "Front Door Camera", True, True, "Front Door", "Disarmed", 80, "1080p", False))
+            home.add_device(Light("L002", "Bedroom Light", True, True, "Bedroom", 60, "White"))
+            light.toggle_power()
+            light.dim(35)
+            home.remove_device("L002")
+            home.change_mode("Night")
+            log.close()
+            
+            restored = EventLog.replay(path)
+            assert restored.name == "My Smart Home"
+            assert restored.mode == "Night"
+            assert restored.render_devices() == home.render_devices()
+            
+            # Compaction folds the log into the snapshot
+            with EventLog(path, compact_every=3).attach(restored) as log:
+                restored.find_device("L001").change_color("Blue")
+                restored.find_device("L001").dim(90)
+                restored.find_device("C001").disarm()
+            assert EventLog.replay(path).render_devices() == restored.render_devices()
+            
+            TestUtils.yakshaAssert("test_event_log_replay", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_event_log_replay", False, "functional")
+            raise e
+    
+    def test_event_log_compaction_crash(self, tmp_path, monkeypatch):
+        """Test that a crash between swapping in the snapshot and truncating the log loses nothing."""
+        try:
+            import smart_home_system.persistence as persistence
+            path = str(tmp_path / "home.log")
+            home = SmartHome("My Smart Home")
+            light = Light("L001", "Kitchen Light", True, True, "Kitchen", 80, "White")
+            home.add_device(light)
+            log = EventLog(path, batch_size=100).attach(home)
+            light.dim(20)
+            log.flush()
+            light.dim(90)  # Still buffered: compaction folds it into the snapshot instead
+            
+            def crashing_open(file, mode="r", *args, **kwargs):
+                if file == path and mode == "w":
+                    raise OSError("crash before truncating the log")
+                return open(file, mode, *args, **kwargs)
+            monkeypatch.setattr(persistence, "open", crashing_open, raising=False)
+            with pytest.raises(OSError):
+                log.compact()
+            monkeypatch.undo()
+            
+            # The untruncated log still ends with dim(20), which the newer snapshot supersedes
+            assert EventLog.replay(path).find_device("L001").brightness == 90
+            
+            # Re-attaching discards the outdated log and keeps logging
+            restored = EventLog.replay(path)
+            with EventLog(path, batch_size=1).attach(restored):
+                restored.find_device("L001").dim(40)
+            assert EventLog.replay(path).find_device("L001").brightness == 40
+            
+            TestUtils.yakshaAssert("test_event_log_compaction_crash", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_event_log_compaction_crash", False, "functional")
+            raise e
+    
+    def test_event_log_torn_tail(self, tmp_path):
+        """Test that logging resumes cleanly after a record torn by a crash."""
+        try:
+            path = str(tmp_path / "home.log")
+            home = SmartHome("My Smart Home")
+            with EventLog(path, batch_size=1).attach(home):
+                home.add_device(Light("L001", "Kitchen Light", True, True, "Kitchen", 50, "White"))
+            with open(path, "a", encoding="utf-8") as log:
+                log.write('{"op":"put","device":{"type":"Li')
+            
+            restored = EventLog.replay(path)
+            assert restored.find_device("L001").brightness == 50
+            with EventLog(path, batch_size=1).attach(restored):
+                restored.add_device(Light("L002", "Hall Light", True, True, "Hallway", 80, "White"))
+                restored.find_device("L001").dim(7)
+            
+            replayed = EventLog.replay(path)
+            assert len(replayed.devices) == 2
+            assert replayed.find_device("L001").brightness == 7
+            
+            # A last record that is complete but lacks its newline is kept
+            with open(path, "a", encoding="utf-8") as log:
+                log.write('{"op":"mode","mode":"Night"}')
+            restored = EventLog.replay(path)
+            with EventLog(path, batch_size=1).attach(restored):
+                restored.find_device("L002").dim(30)
+            replayed = EventLog.replay(path)
+            assert replayed.mode == "Night" and replayed.find_device("L002").brightness == 30
+            
+            TestUtils.yakshaAssert("test_event_log_torn_tail", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_event_log_torn_tail", False, "functional")
+            raise e
+    
+    def test_thread_safe_home(self):
+        """Test concurrent device registration and control on a thread-safe home."""
+        try:
+            home = SmartHome("My Smart Home", thread_safe=True)
+            home.add_device(Light("L000", "Shared Light", True, True, "Kitchen", 0, "White"))
+            
+            def worker(n):
+                for i in range(200):
+                    device_id = f"L{n}-{i}"
+                    home.add_device(Light(device_id, "Light", True, True, f"Room {n}", 50, "White"))
+                    home.control(device_id, "dim", i % 101)
+                    home.find_device("L000")
+                    home.get_devices_by_room("Kitchen")
+                    if i % 2:
+                        home.remove_device(device_id)
+            
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            home.execute_automation("Good Night")
+            for thread in threads:
+                thread.join()
+            
+            assert len(home.devices) == 1 + 4 * 100
+            assert home.rooms == {"Kitchen", "Room 0", "Room 1", "Room 2", "Room 3"}
+            assert home.control("L000", "dim", 75) == 75
+            try:
+                home.control("L000", "_changed")
+                assert False, "Should raise InvalidInputException"
+            except InvalidInputException:
+                pass  # Expected behavior
+            
+            TestUtils.yakshaAssert("test_thread_safe_home", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_thread_safe_home", False, "functional")
+            raise e
+    
+    def test_snapshots(self):
+        """Test immutable, structurally shared snapshots of the home."""
+        try:
+            home = SmartHome("My Smart Home")
+            kitchen = Light("L001", "Kitchen Light", True, True, "Kitchen", 80, "White")
+            bedroom = Light("L002", "Bedroom Light", True, True, "Bedroom", 60, "White")
+            home.add_device(kitchen)
+            home.add_device(bedroom)
+            
+            first = home.snapshot()
+            assert home.snapshot() is first
+            assert first.devices == (kitchen, bedroom)
+            assert first.rooms == {"Kitchen", "Bedroom"}
+            assert first.find_device("L002") is bedroom
+            assert first.display_info() == home.display_info()
+            
+            # Writers leave earlier snapshots untouched
+            home.add_device(Light("L003", "Kitchen Spot", True, True, "Kitchen", 40, "White"))
+            home.remove_device("L002")
+            second = home.snapshot()
+            assert len(first.devices) == 2
+            assert first.get_devices_by_room("Bedroom") == (bedroom,)
+            assert [d.id for d in second.devices] == ["L001", "L003"]
+            assert second.rooms == {"Kitchen"}
+            assert second.get_devices_by_room("Bedroom") == ()
+            
+            # Unchanged rooms and mode-only changes share structure
+            home.add_device(Thermostat("T001", "Main Thermostat", True, True, "Hallway", 22.5, "Heat", 23.0))
+            third = home.snapshot()
+            assert third.get_devices_by_room("Kitchen") is second.get_devices_by_room("Kitchen")
+            home.change_mode("Vacation")
+            fourth = home.snapshot()
+            assert fourth.mode == "Vacation" and third.mode == "Home"
+            assert fourth.devices is third.devices
+            
+            TestUtils.yakshaAssert("test_snapshots", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_snapshots", False, "functional")
+            raise e
+    
+    def test_energy_estimation(self):
+        """Test the per-class power model and the vectorized estimator."""
+        pytest.importorskip("numpy")
+        try:
+            home = SmartHome("My Smart Home")
+            light = Light("L001", "Kitchen Light", True, True, "Kitchen", 50, "White")
+            thermostat = Thermostat("T001", "Main Thermostat", True, True, "Hallway", 20.0, "Heat", 22.0)
+            camera = Camera("C001", "Front Door Camera", True, True, "Front Door", "Armed", 80, "1080p", True)
+            for device in [light, thermostat, camera]:
+                home.add_device(device)
+            
+            assert light.power_watts() == 5.0
+            assert thermostat.power_watts() == 3.0 + 3000.0 * 2.0 / 5.0
+            assert camera.power_watts() == 7.0
+            
+            estimator = EnergyEstimator(home)
+            assert estimator.instant_watts() == home.power_watts()
+            
+            # Row updates and membership changes are picked up
+            light.toggle_power()
+            thermostat.change_mode("Cool")
+            home.add_device(MotionSensor("M001", "Backyard Sensor", True, True, "Backyard", "Armed", 60, 10, None))
+            assert estimator.instant_watts() == home.power_watts()
+            assert estimator.projected_kwh(10) == home.power_watts() * 10 / 1000
+            estimator.close()
+            
+            TestUtils.yakshaAssert("test_energy_estimation", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_energy_estimation", False, "functional")
+            raise e
+    
+    def test_thermostat_simulation(self):
+        """Test that simulated rooms move toward their targets according to mode."""
+        pytest.importorskip("numpy")
+        try:
+            heater = Thermostat("T001", "Heater", True, True, "Bedroom", 15.0, "Heat", 21.0)
+            cooler = Thermostat("T002", "Cooler", True, True, "Office", 28.0, "Cool", 22.0)
+            idle = Thermostat("T003", "Idle", True, True, "Garage", 25.0, "Off", 21.0)
+            
+            simulator = ThermostatSimulator([heater, cooler, idle], ambient=20.0, drift_rate=0.0)
+            temperatures = simulator.step(0.25, steps=40)
+            assert abs(temperatures[0] - 21.0) < 0.5
+            assert abs(temperatures[1] - 22.0) < 0.5
+            assert temperatures[2] == 25.0
+            
+            # Control changes apply after sync, results land on the devices
+            idle.change_mode("Cool")
+            simulator.sync()
+            simulator.step(0.25, steps=40)
+            simulator.write_back()
+            assert abs(idle.temperature - 21.0) < 0.5
+            assert "Current: " + str(idle.temperature) in idle.display_info()
+            
+            TestUtils.yakshaAssert("test_thermostat_simulation", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_thermostat_simulation", False, "functional")
+            raise e
+    
+    def test_synthetic_generator(self):
+        """Test deterministic, lazily streamed synthetic homes and fleets."""
+        try:
+            devices = generate_devices(500, seed=7)
+            assert not isinstance(devices, list)
+            first = [d.display_info() for d in devices]
+            assert first == [d.display_info() for d in generate_devices(500, seed=7)]
+            assert first != [d.display_info() for d in generate_devices(500, seed=8)]
+            
+            home = generate_home(500, seed=7)
+            assert len(home.devices) == 500
+            assert len(home.get_devices_by_type(Light)) > len(home.get_devices_by_type(Camera))
+            for device in home.get_devices_by_type(Camera):
+                assert device.location in ["Front Door", "Backyard", "Garage"]
+            
+            fleet = generate_fleet(3, 50, seed=1)
+            homes = list(fleet)
+            assert [h.name for h in homes] == ["Home 0", "Home 1", "Home 2"]
+            assert homes[0].render_devices() != homes[1].render_devices()
+            
+            TestUtils.yakshaAssert("test_synthetic_generator", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_synthetic_generator", False, "functional")
+            raise e
+    
+    def test_batch_runner(self):
+        """Test the non-interactive batch command runner."""
+        try:
+            home = SmartHome("My Smart Home")
+            script = [
+                "# setup",
+                'add {"type": "Light", "id": "L001", "name": "Kitchen Light", "is_on": false, '
+                '"connected": true, "location": "Kitchen", "brightness": 70, "color": "White"}',
+                "control L001 toggle_power",
+                "control L001 dim 40",
+                'control L001 change_color "Warm White"',
+                "control L001 dim 400",
+                "control L404 dim 10",
+                "",
+                "mode Vacation",
+                "list Kitchen",
+                "explode",
+            ]
+            out = io.StringIO()
+            assert run_batch(home, script, out) == (6, 3)
+            
+            # Device IDs and command names stay strings even when they look like JSON
+            home.add_device(Light("123", "Hall Light", True, True, "Hall", 80, "White"))
+            assert run_batch(home, ["control 123 dim 10", "control true dim 10"], io.StringIO()) == (1, 1)
+            assert home.find_device("123").brightness == 10
+            
+            light = home.find_device("L001")
+            assert light.is_on is False  # Vacation Mode switches lights off
+            assert light.brightness == 40
+            assert light.color == "Warm White"
+            assert home.mode == "Vacation"
+            
+            lines = out.getvalue().splitlines()
+            assert lines[0] == "line 6: Brightness must be between 0-100"
+            assert lines[1] == "line 7: Device with ID L404 not found"
+            assert lines[2] == light.display_info()
+            assert lines[3] == "line 11: Unknown command: explode"
+            
+            TestUtils.yakshaAssert("test_batch_runner", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_batch_runner", False, "functional")
+            raise e
+    
+    def test_http_server(self):
+        """Test the HTTP/JSON control server routes and keep-alive connections."""
+        try:
+            home = SmartHome("My Smart Home")
+            server = HomeServer(home, port=0)
+            light = {"type": "Light", "id": "L001", "name": "Kitchen Light", "is_on": True,
+                     "connected": True, "location": "Kitchen", "brightness": 70, "color": "White"}
+            
+            assert server.handle("POST", "/devices", json.dumps(light).encode())[0] == 201
+            assert server.handle("POST", "/devices", json.dumps(light).encode())[0] == 409
+            status, payload = server.handle("POST", "/devices/L001/dim", b'{"args": [25]}')
+            assert status == 200 and payload["result"] == 25
+            assert server.handle("POST", "/devices/L001/dim", b'{"args": [250]}')[0] == 400
+            assert server.handle("GET", "/devices/L404")[0] == 404
+            assert server.handle("PUT", "/devices")[0] == 405
+            assert server.handle("GET", "/nowhere")[0] == 404
+            assert server.handle("GET", "/devices?room=Kitchen&type=Light")[1][0]["brightness"] == 25
+            assert server.handle("POST", "/mode", b'{"mode": "Night"}') == (200, {"mode": "Night"})
+            status, payload = server.handle("POST", "/batch", b'{"commands": ["control L001 dim 60", "mode Nowhere"]}')
+            assert payload["executed"] == 1 and payload["failed"] == 1
+            # Bodies of the wrong shape are client errors, not server errors
+            assert server.handle("POST", "/devices/L001/dim", b'[25]')[0] == 400
+            assert server.handle("POST", "/devices/L001/dim", b'{"args": 25}')[0] == 400
+            assert server.handle("POST", "/batch", b'{"commands": "mode Away"}')[0] == 400
+            assert server.handle("POST", "/batch", b'{"commands": [["mode", "Away"]]}')[0] == 400
+            assert home.mode == "Night"
+            assert server.handle("GET", "/home")[1]["rooms"] == {"Kitchen": 1}
+            
+            async def exchange():
+                await server.start()
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                responses = []
+                for path in ["/devices/L001", "/home"]:
+                    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                    await writer.drain()
+                    status_line = await reader.readline()
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line == b"\r\n":
+                            break
+                        key, _, value = line.decode().partition(":")
+                        headers[key.lower()] = value.strip()
+                    body = await reader.readexactly(int(headers["content-length"]))
+                    responses.append((status_line.split()[1], headers["connection"], json.loads(body)))
+                writer.close()
+                
+                # Malformed requests still get a 400 response before the connection closes
+                for request in [b"GARBAGE\r\n\r\n", b"POST /mode HTTP/1.1\r\nContent-Length: lots\r\n\r\n"]:
+                    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                    writer.write(request)
+                    await writer.drain()
+                    responses.append((await reader.read()).split(b" ", 2)[1])
+                    writer.close()
+                await server.close()
+                return responses
+            
+            responses = asyncio.run(exchange())
+            assert responses[0][:2] == (b"200", "keep-alive")
+            assert responses[0][2]["brightness"] == 60
+            assert responses[1][2]["mode"] == "Night"
+            assert responses[2:] == [b"400", b"400"]
+            
+            TestUtils.yakshaAssert("test_http_server", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_http_server", False, "functional")
+            raise e
+    
+    def test_device_type_registry(self):
+        """Test plugging a new device type into command and automation dispatch."""
+        try:
+            class SmartPlug(Device):
+                FIELDS = Device.FIELDS + ("load_watts",)
+                
+                def __init__(self, id, name, is_on, connected, location, load_watts):
+                    super().__init__(id, name, is_on, connected, location)
+                    self._load_watts = load_watts
+                
+                def set_load(self, watts):
+                    self._load_watts = watts
+                    self._changed()
+                    return self._load_watts
+            
+            def plug_away(device):
+                if device.is_on:
+                    device.toggle_power()
+            
+            registered = register_device_type(SmartPlug, commands={"set_load": (float,)},
+                                              scenes={"Away Mode": plug_away})
+            assert device_type(SmartPlug) is registered
+            assert "toggle_power" in registered.commands
+            assert [label for label, _ in registered.menu] == ["Toggle Power", "Connect/Disconnect"]
+            
+            home = SmartHome("My Smart Home")
+            plug = SmartPlug("P001", "Desk Plug", True, True, "Office", 60)
+            home.add_device(plug)
+            assert home.control("P001", "set_load", "75.5") == 75.5
+            try:
+                home.control("P001", "dim", 10)
+                assert False, "Should raise InvalidInputException"
+            except InvalidInputException:
+                pass  # Expected behavior
+            
+            home.execute_automation("Away Mode")
+            assert plug.is_on is False
+            assert isinstance(Device.from_dict(plug.to_dict()), SmartPlug)
+            
+            # Unregistered subclasses resolve to their nearest registered base
+            class OutdoorLight(Light):
+                pass
+            assert device_type(OutdoorLight) is device_type(Light)
+            
+            TestUtils.yakshaAssert("test_device_type_registry", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_device_type_registry", False, "functional")
+            raise e
+    
+    def test_batch_validation(self):
+        """Test bulk validation of raw records against the per-class schemas."""
+        try:
+            records = [device.to_dict() for device in generate_devices(50, seed=3)]
+            records[4] = dict(Light("L1", "Lamp", True, True, "Hall", 50, "White").to_dict(), brightness=150)
+            records[7] = dict(Thermostat("T1", "Heater", True, True, "Hall", 20, "Heat", 21).to_dict(), mode="Dry")
+            records[9] = {"type": "Toaster", "id": "X1"}
+            records[11] = dict(SecurityDevice("S1", "Door", True, True, "Hall", False, 50).to_dict())
+            del records[11]["sensitivity"]
+            records[12] = dict(Light("L2", "Lamp", True, True, "Hall", 50, "White").to_dict(), brightness="bright")
+            
+            errors = Device.validate_records(records)
+            assert errors[4] == ["Brightness must be between 0-100"]
+            assert errors[7] == ["Mode must be one of ['Heat', 'Cool', 'Auto', 'Off']"]
+            assert errors[9] == ["Unknown device type: Toaster"]
+            assert errors[11] == ["Missing device field: sensitivity"]
+            assert errors[12] == ["Brightness must be between 0-100"]
+            assert sum(1 for row in errors if row) == 5
+            
+            count = Device.device_count
+            devices, failures = Device.from_records(records)
+            assert len(devices) == 45
+            assert sorted(failures) == [4, 7, 9, 11, 12]
+            # Validated rows skip the constructors but build equivalent, counted devices
+            assert Device.device_count == count + 45
+            assert [d.to_dict() for d in devices] == [Device.from_dict(records[row]).to_dict()
+                                                      for row in range(len(records)) if row not in failures]
+            assert all(d.display_info() and d._observers == [] for d in devices)
+            
+            # Single construction goes through the same schema
+            assert Light.SCHEMA.check("brightness", 100) == 100
+            try:
+                Light("L3", "Lamp", True, True, "Hall", "bright", "White")
+                assert False, "Should raise InvalidInputException"
+            except InvalidInputException:
+                pass  # Expected behavior
+            
+            TestUtils.yakshaAssert("test_batch_validation", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_batch_validation", False, "functional")
+            raise e
+    
+    def test_interned_attributes(self):
+        """Test that repeated string attributes are shared and can be dumped as symbol codes."""
+        try:
+            home = SmartHome("My Smart Home")
+            home.add_device(Light("L001", "Kitchen Light", True, True, "".join(["Kit", "chen"]), 70, "White"))
+            home.add_device(Light("L002", "Pantry Light", True, True, "".join(["Kitch", "en"]), 40, "White"))
+            home.add_device(Camera("C001", "Front Door Camera", True, True, "Front Door", "Armed", 80, "1080p", True))
+            first, second = home.get_devices_by_room("".join(["K", "itchen"]))
+            assert first.location is second.location
+            
+            buffer = io.StringIO()
+            home.dump(buffer)
+            header, *records = [json.loads(line) for line in buffer.getvalue().splitlines()]
+            assert "symbols" not in header and records[0]["location"] == "Kitchen"
+            
+            buffer = io.StringIO()
+            home.dump(buffer, symbols=True)
+            header, *records = [json.loads(line) for line in buffer.getvalue().splitlines()]
+            assert header["symbols"][records[0]["location"]] == "Kitchen"
+            assert records[0]["location"] == records[1]["location"]
+            assert header["symbols"][records[2]["resolution"]] == "1080p"
+            
+            buffer.seek(0)
+            loaded = SmartHome.load(buffer)
+            assert loaded.render_devices() == home.render_devices()
+            assert loaded.find_device("C001").armed_status is home.find_device("C001").armed_status
+            
+            # Dumps without symbol codes load the same way
+            plain = io.StringIO(json.dumps({"name": "Old", "mode": "Home"}) + "\n" + json.dumps(first.to_dict()) + "\n")
+            assert SmartHome.load(plain).find_device("L001").location == "Kitchen"
+            
+            TestUtils.yakshaAssert("test_interned_attributes", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_interned_attributes", False, "functional")
+            raise e
+    
+    def test_security_sweep(self):
+        """Test the indexed security queries and arm/disarm sweeps."""
+        try:
+            home = SmartHome("My Smart Home")
+            home.add_device(Light("L001", "Kitchen Light", True, True, "Kitchen", 70, "White"))
+            camera = Camera("C001", "Front Door Camera", True, True, "Front Door", "Armed", 80, "1080p", True)
+            sensor = MotionSensor("M001", "Backyard Sensor", False, True, "Backyard", "Disarmed", 60, 10, None)
+            home.add_device(camera)
+            home.add_device(sensor)
+            
+            assert home.get_security_devices(armed_status="Armed") == [camera]
+            assert home.get_security_devices(is_on=False) == [sensor]
+            assert home.security_sweep("report") == [sensor]
+            
+            assert home.security_sweep("arm") == [sensor]
+            assert sensor.is_on and sensor.armed_status == "Armed"
+            assert home.security_sweep("report") == []
+            
+            camera.toggle_power()  # Powering off disarms; the index follows
+            assert home.get_security_devices(armed_status="Disarmed", is_on=False) == [camera]
+            assert home.security_sweep("disarm") == [sensor]
+            assert len(home.get_security_devices(armed_status="Disarmed")) == 2
+            
+            home.remove_device("C001")
+            assert home.get_security_devices() == [sensor]
+            try:
+                home.security_sweep("panic")
+                assert False, "Should raise InvalidInputException"
+            except InvalidInputException:
+                pass  # Expected behavior
+            
+            TestUtils.yakshaAssert("test_security_sweep", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_security_sweep", False, "functional")
+            raise e
+    
+    def test_camera_recording_store(self, tmp_path):
+        """Test camera segments in the ring file, including overwrite of old frames."""
+        try:
+            home = SmartHome("My Smart Home")
+            camera = Camera("C001", "Front Door Camera", True, True, "Front Door", "Disarmed", 80, "1080p", False)
+            other = Camera("C002", "Garage Camera", True, True, "Garage", "Disarmed", 80, "720p", True)
+            home.add_device(camera)
+            home.add_device(other)
+            
+            with RecordingStore(str(tmp_path / "frames.ring"), capacity=1024).attach(home) as store:
+                assert store.append("C001", b"x" * 10) is False  # Not recording yet
+                camera.start_recording()
+                for i in range(3):
+                    assert store.append("C001", bytes([i]) * 40, timestamp=100.0 + i)
+                    assert store.append("C002", b"other", timestamp=100.0 + i)
+                camera.stop_recording()
+                (segment,) = store.segments("C001")
+                assert segment.stop is not None and segment.frames == 3 and segment.nbytes == 120
+                assert [(ts, bytes(data)) for ts, data in store.read(segment)] == \
+                    [(100.0 + i, bytes([i]) * 40) for i in range(3)]
+                
+                # Filling the ring overwrites and drops the closed segment
+                for i in range(100):
+                    store.append("C002", b"y" * 30, timestamp=200.0 + i)
+                assert store.segments("C001") == []
+                (live,) = store.segments("C002")
+                frames = list(store.read(live))
+                assert 0 < len(frames) < 103
+                assert frames[-1] == (299.0, b"y" * 30)
+                
+                home.remove_device("C002")
+                assert live.stop is not None
+            
+            TestUtils.yakshaAssert("test_camera_recording_store", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_camera_recording_store", False, "functional")
+            raise e
+    
+    def test_motion_analytics(self):
+        """Test sliding-window trigger counts per sensor and per room."""
+        try:
+            clock = [1000.0]
+            home = SmartHome("My Smart Home")
+            front = MotionSensor("M001", "Front Sensor", True, True, "Front Door", "Armed", 60, 10, None)
+            porch = MotionSensor("M002", "Porch Sensor", True, True, "Front Door", "Armed", 60, 10, None)
+            home.add_device(front)
+            home.add_device(porch)
+            analytics = MotionAnalytics(home, clock=lambda: clock[0])
+            
+            for _ in range(3):
+                front.detect_motion("12:00")
+            porch.detect_motion("12:00")
+            front.reset_trigger()  # Clearing the last trigger keeps the history
+            assert analytics.sensor_count("M001") == 3
+            assert analytics.room_count("Front Door") == 4
+            assert analytics.alerts(3) == {"M001": 3}
+            
+            clock[0] += 90  # Past the minute window, inside the hour
+            porch.detect_motion("12:01")
+            assert analytics.sensor_count("M001") == 0
+            assert analytics.sensor_count("M001", "hour") == 3
+            assert analytics.room_count("Front Door") == 1
+            assert analytics.room_count("Front Door", "hour") == 5
+            
+            with home.transaction():
+                porch.detect_motion("12:02")
+                porch.detect_motion("12:03")
+            assert analytics.sensor_count("M002") == 3
+            
+            clock[0] += 7200
+            assert analytics.room_count("Front Door", "hour") == 0
+            assert analytics.sensor_count("M999") == 0
+            analytics.close()
+            
+            TestUtils.yakshaAssert("test_motion_analytics", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_motion_analytics", False, "functional")
+            raise e
+    
+    def test_heartbeat_monitor(self):
+        """Test heartbeat expiry and the incrementally maintained connected count."""
+        try:
+            clock = [0.0]
+            home = SmartHome("My Smart Home")
+            for i in range(5):
+                home.add_device(Light(f"L{i}", f"Light {i}", True, True, "Kitchen", 50, "White"))
+            monitor = HeartbeatMonitor(home, timeout=10, resolution=1, clock=lambda: clock[0])
+            assert home.connected_count == 5
+            
+            clock[0] = 6
+            monitor.heartbeat("L0")
+            monitor.heartbeat("L1")
+            assert monitor.tick() == []
+            
+            clock[0] = 12
+            assert sorted(monitor.tick()) == ["L2", "L3", "L4"]
+            assert home.connected_count == 2
+            assert "Connected Devices: 2/5" in home.display_info()
+            
+            monitor.heartbeat("L3")  # A late heartbeat reconnects the device
+            assert home.find_device("L3").connected
+            home.add_device(Light("L9", "Light 9", True, False, "Hall", 50, "White"))
+            assert home.connected_count == 3
+            
+            clock[0] = 100
+            assert sorted(monitor.tick()) == ["L0", "L1", "L3", "L9"]
+            assert home.connected_count == 0
+            home.remove_device("L0")
+            assert monitor.tick() == []
+            monitor.close()
+            
+            TestUtils.yakshaAssert("test_heartbeat_monitor", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_heartbeat_monitor", False, "functional")
+            raise e
+    
+    def test_room_hierarchy(self):
+        """Test floor/zone/room rollups and subtree queries as devices change."""
+        try:
+            home = SmartHome("My Smart Home")
+            kitchen = Light("L001", "Kitchen Light", True, True, "Kitchen", 70, "White")
+            home.add_device(kitchen)
+            home.add_device(Light("L002", "Bedroom Light", False, True, "Bedroom", 40, "White"))
+            home.add_device(Camera("C001", "Hall Camera", True, False, "Hall", "Armed", 80, "1080p", True))
+            hierarchy = RoomHierarchy(home, {"Kitchen": (1, "East"), "Hall": (1, "West"), "Bedroom": (3, "East")})
+            
+            assert hierarchy.rollup() == {"devices": 3, "on": 2, "connected": 2, "armed": 1}
+            assert hierarchy.rollup(floor=1) == {"devices": 2, "on": 2, "connected": 1, "armed": 1}
+            assert hierarchy.rollup(floor=1, zone="East") == {"devices": 1, "on": 1, "connected": 1, "armed": 0}
+            assert [d.id for d in hierarchy.devices(Light, floor=3)] == ["L002"]
+            assert [d.id for d in hierarchy.devices(SecurityDevice, floor=1)] == ["C001"]
+            
+            kitchen.toggle_power()
+            home.find_device("C001").disarm()
+            home.add_device(Light("L003", "Bedroom Lamp", True, True, "Bedroom", 20, "Blue"))
+            assert hierarchy.rollup(floor=1) == {"devices": 2, "on": 1, "connected": 1, "armed": 0}
+            assert hierarchy.rollup(room="Bedroom") == {"devices": 2, "on": 1, "connected": 2, "armed": 0}
+            
+            hierarchy.assign("Bedroom", 2, "North")
+            assert hierarchy.rollup(floor=3)["devices"] == 0
+            assert sorted(d.id for d in hierarchy.devices(Light, floor=2)) == ["L002", "L003"]
+            home.remove_device("L003")
+            dashboard = hierarchy.dashboard()
+            assert sorted(dashboard) == [1, 2]
+            assert dashboard[2]["zones"]["North"]["rooms"]["Bedroom"]["devices"] == 1
+            assert hierarchy.rollup() == {"devices": 3, "on": 1, "connected": 2, "armed": 0}
+            hierarchy.close()
+            
+            TestUtils.yakshaAssert("test_room_hierarchy", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_room_hierarchy", False, "functional")
+            raise e
+    
+    def test_mode_transitions(self):
+        """Test mode automations, including Vacation, and their plan cache invalidation."""
+        try:
+            home = SmartHome("My Smart Home")
+            hall = Light("L001", "Hallway Light", False, True, "Hallway", 80, "White")
+            bedroom = Light("L002", "Bedroom Light", True, True, "Bedroom", 40, "White")
+            thermostat = Thermostat("T001", "Main Thermostat", True, True, "Living Room", 21, "Cool", 23)
+            camera = Camera("C001", "Front Door Camera", True, True, "Front Door", "Armed", 80, "1080p", False)
+            for device in (hall, bedroom, thermostat, camera):
+                home.add_device(device)
+            changed = []
+            home.subscribe(lambda event, subject: changed.append(subject.id) if event == "changed" else None)
+            
+            assert MODE_AUTOMATIONS["Night"] == "Good Night"
+            home.change_mode("Night")
+            assert hall.is_on and hall.brightness == 30 and not bedroom.is_on
+            assert (thermostat.target_temp, thermostat.mode) == (18, "Heat")
+            assert camera.recording  # Already armed; only recording needed to change
+            
+            changed.clear()
+            home.change_mode("Night")  # Settled: nothing to write
+            assert changed == []
+            
+            home.change_mode("Vacation")
+            assert not hall.is_on and (thermostat.target_temp, thermostat.mode) == (12, "Heat")
+            assert home.mode == "Vacation"
+            
+            # Plans are rebuilt after membership changes
+            late = Light("L003", "Kitchen Light", False, True, "Kitchen", 10, "White")
+            home.add_device(late)
+            home.change_mode("Home")
+            assert late.is_on and late.brightness == 100
+            assert bedroom.is_on and bedroom.brightness == 60
+            
+            # A failed transaction undoes the writes of a mode's automation
+            try:
+                with home.transaction():
+                    home.change_mode("Away")
+                    raise ValueError("abort")
+            except ValueError:
+                pass
+            assert home.mode == "Home" and late.is_on and thermostat.mode == "Heat"
+            
+            TestUtils.yakshaAssert("test_mode_transitions", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_mode_transitions", False, "functional")
+            raise e
+    
+    def test_idempotent_automations(self):
+        """Test that automations only write differing attributes and report the counts."""
+        try:
+            home = SmartHome("My Smart Home")
+            hall = Light("L001", "Hallway Light", True, True, "Hallway", 80, "White")
+            bedroom = Light("L002", "Bedroom Light", False, True, "Bedroom", 40, "White")
+            thermostat = Thermostat("T001", "Main Thermostat", True, True, "Living Room", 21, "Heat", 18)
+            for device in (hall, bedroom, thermostat):
+                home.add_device(device)
+            changed = []
+            home.subscribe(lambda event, subject: changed.append(subject.id) if event == "changed" else None)
+            
+            # Good Night: hall dims (brightness), bedroom is already off, thermostat already 18/Heat
+            applied, skipped = home.run_automation("Good Night")
+            assert (applied, skipped) == (1, 5) and changed == ["L001"]
+            
+            changed.clear()
+            assert home.run_automation("Good Night") == (0, 6) and changed == []
+            
+            # Only the drifted device is looked at again, and only its differing attribute written
+            bedroom.toggle_power()
+            changed.clear()
+            assert home.run_automation("Good Night") == (1, 5) and not bedroom.is_on
+            assert changed == ["L002"]
+            
+            assert home.execute_automation("Good Night") is True
+            assert home.execute_automation("Party Mode") is False
+            with pytest.raises(InvalidInputException):
+                home.run_automation("Party Mode")
+            
+            TestUtils.yakshaAssert("test_idempotent_automations", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_idempotent_automations", False, "functional")
+            raise e
+    
+    def test_device_history(self):
+        """Test delta-encoded device history, time-travel queries and retention."""
+        try:
+            now = [0.0]
+            home = SmartHome("My Smart Home")
+            light = Light("L001", "Living Room Light", False, True, "Living Room", 50, "White")
+            camera = Camera("C001", "Front Door Camera", True, True, "Front Door", "Disarmed", 80, "1080p", False)
+            home.add_device(light)
+            home.add_device(camera)
+            history = DeviceHistory(home, retention=15.0, block_size=2, clock=lambda: now[0])
+            
+            now[0] = 10.0
+            light.toggle_power()
+            now[0] = 20.0
+            light.dim(80)
+            light.change_color("Blue")  # Same second: one delta per write
+            now[0] = 30.0
+            camera.arm()  # Arming a camera also starts recording
+            
+            assert history.state_at("L001", -1.0) is None
+            assert history.state_at("L001", 5.0)["is_on"] is False
+            assert history.state_at("L001", 15.0)["is_on"] is True
+            past = history.state_at("L001", 25.0)
+            assert (past["brightness"], past["color"], past["location"]) == (80, "Blue", "Living Room")
+            assert history.state_at("C001", 30.0)["armed_status"] == "Armed"
+            assert history.changes("L001", since=20.0) == [(20.0, {"brightness": 80}), (20.0, {"color": "Blue"})]
+            
+            # Removed devices read as absent afterwards but keep their history
+            now[0] = 40.0
+            home.remove_device("C001")
+            assert history.state_at("C001", 45.0) is None
+            assert history.state_at("C001", 35.0)["recording"] is True
+            
+            # Retention drops whole blocks and expired removed devices
+            now[0] = 60.0
+            light.dim(10)
+            history.trim()
+            assert history.state_at("L001", 5.0) is None
+            assert history.state_at("L001", 60.0)["brightness"] == 10
+            assert history.state_at("C001", 35.0) is None
+            
+            history.close()
+            light.dim(20)
+            assert history.state_at("L001", 100.0)["brightness"] == 10
+            
+            TestUtils.yakshaAssert("test_device_history", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_device_history", False, "functional")
+            raise e
+    
+    def test_lazy_subsystems(self):
+        """Test that importing the core leaves subsystems and heavy dependencies unloaded."""
+        try:
+            code = ("import sys, smart_home_system as s; s.SmartHome('h'); "
+                    "print(sorted(m for m in ('asyncio', 'json', 'mmap', 'numpy', 'msgpack', "
+                    "'smart_home_system.server', 'smart_home_system.recording') if m in sys.modules)); "
+                    "s.RecordingStore; print('smart_home_system.recording' in sys.modules, 'asyncio' in sys.modules)")
+            output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                    cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+            assert output.split("\n")[:2] == ["[]", "True False"]
+            
+            import smart_home_system
+            assert smart_home_system.HomeServer is HomeServer and "DeviceHistory" in dir(smart_home_system)
+            with pytest.raises(AttributeError):
+                smart_home_system.NoSuchSubsystem
+            
+            TestUtils.yakshaAssert("test_lazy_subsystems", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_lazy_subsystems", False, "functional")
+            raise e
+    
+    def test_result_sinks(self, monkeypatch, capsys):
+        """Test the buffered offline result sinks used by TestUtils."""
+        try:
+            memory = MemorySink()
+            memory.publish({"methodName": "a", "status": "Passed"})
+            memory.publish({"methodName": "b", "status": "Failed"})
+            assert memory.published == []  # Nothing leaves the buffer before a flush
+            assert memory.flush("", None, None) == 2
+            assert [r["methodName"] for r in memory.published] == ["a", "b"] and memory.results == []
+            
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "results.jsonl")
+                sink = sink_from_environment("http://unused", "guid", os.path.join(directory, "custom.ih"))
+                assert isinstance(sink, MemorySink)  # No custom.ih: stay offline
+                monkeypatch.setenv("YAKSHA_RESULT_SINK", "file:" + path)
+                sink = sink_from_environment("http://unused", "guid", os.path.join(directory, "custom.ih"))
+                assert isinstance(sink, FileSink)
+                sink.publish({"methodName": "c", "status": "Passed"})
+                sink.flush("", None, None)
+                with open(path, encoding="utf-8") as stream:
+                    assert [json.loads(line)["methodName"] for line in stream] == ["c"]
+            
+            # Without the requests package the HTTP sink reports once and keeps the results locally
+            monkeypatch.setitem(sys.modules, "requests", None)
+            fallback = MemorySink()
+            sink = HttpSink("http://unused", "guid", fallback)
+            sink.publish({"methodName": "d", "status": "Passed"})
+            capsys.readouterr()
+            assert sink.flush("", "host", None) == 1
+            assert len(capsys.readouterr().out.splitlines()) == 1
+            assert [r["methodName"] for r in fallback.published] == ["d"] and sink.results == []
+            
+            # A rejected post and a failed one are summed up in one line; posting stops at the failure
+            posts = []
+            
+            class FakeSession:
+                def __enter__(self):
+                    return self
+                
+                def __exit__(self, *exc_info):
+                    pass
+                
+                def post(self, url, data, timeout=None, headers=None):
+                    posts.append(timeout)
+                    if len(posts) == 2:
+                        raise OSError("unreachable")
+                    return type("Response", (), {"status_code": 500})()
+            monkeypatch.setitem(sys.modules, "requests", type(sys)("requests"))
+            sys.modules["requests"].Session = FakeSession
+            fallback = MemorySink()
+            sink = HttpSink("http://unused", "guid", fallback)
+            for name in ("e", "f", "g"):
+                sink.publish({"methodName": name, "status": "Passed"})
+            assert sink.flush("", "host", None) == 3
+            assert posts == [HttpSink.TIMEOUT, HttpSink.TIMEOUT]
+            assert len(capsys.readouterr().out.splitlines()) == 1
+            assert [r["methodName"] for r in fallback.published] == ["e", "f", "g"]
+            
+            TestUtils.yakshaAssert("test_result_sinks", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_result_sinks", False, "functional")
+            raise e
+    
+    def test_isolated_device_state(self):
+        """Test per-test device counting and registry isolation used for parallel runs."""
+        try:
+            assert Device.device_count == 0  # Reset for every test by conftest
+            with pytest.raises(InvalidInputException):
+                Device("", "Broken", True, True, "Hall")
+            assert Device.device_count == 0  # A failed constructor is not counted
+            
+            kept = [Device("D001", "Device", True, True, "Hall")]
+            Device.reset_device_count()
+            kept.clear()  # Devices from before the reset no longer change the count
+            assert Device.device_count == 0
+            
+            def create(devices):
+                for number in range(500):
+                    devices.append(Device(f"D{number}", "Device", True, True, "Hall"))
+            lists = [[] for _ in range(4)]
+            threads = [threading.Thread(target=create, args=(devices,)) for devices in lists]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert Device.device_count == 2000
+            
+            class SmartPlug(Device):
+                pass
+            with isolated_registry():
+                register_device_type(SmartPlug)
+                assert device_type(SmartPlug).cls is SmartPlug
+            assert device_type(SmartPlug) is device_type(Device)
+            
+            TestUtils.yakshaAssert("test_isolated_device_state", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_isolated_device_state", False, "functional")
+            raise e
+    
     def test_encapsulation(self):
         """Test proper encapsulation with protected and private attributes."""
         try: